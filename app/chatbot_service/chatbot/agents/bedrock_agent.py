@@ -1,65 +1,100 @@
 from chatbot.chains.qa_chain import build_qa_chain
 from chatbot.retrievers.kb_retriever import get_kb_retriever, get_llm
+from chatbot.retrievers.sentence_ranker import rank_sentences
+from chatbot.agents.semantic_cache import semantic_answer_cache
+from core.config import settings
+import json
 import re
 
 # Relevance score threshold (documents below this score will be ignored)
 RELEVANCE_THRESHOLD = 0.5
 
-def extract_best_time_and_text_with_ai(content: str, question: str, llm) -> str:
-    """Extracts the most relevant timestamped sentence from the content using AI"""
-    pattern = r'\[at (\d+\.?\d*) seconds?\]\s*([^\n\r]+)'
-    matches = re.findall(pattern, content)
-    
-    if not matches:
-        return "No timestamped sentences found."
-    
-    if len(matches) == 1:
-        sec, txt = matches[0]
-        seconds = float(sec)
-        minutes = int(seconds // 60)
-        remaining_seconds = int(seconds % 60)
-        time_str = f"{minutes}:{remaining_seconds:02d}" if minutes > 0 else f"{remaining_seconds}s"
-        return f"{time_str}: {txt.strip()}"
-    
-    try:
-        # Build prompt for LLM to select the best sentence
-        evaluation_prompt = f"""
-Select the most relevant sentence based on the following question.
+TIMESTAMP_PATTERN = re.compile(r'\[at (\d+\.?\d*) seconds?\]\s*([^\n\r]+)')
 
-Question: {question}
+def extract_timestamped_sentences(content: str):
+    """Return (seconds, text) pairs for every `[at N seconds]` line in the content"""
+    return TIMESTAMP_PATTERN.findall(content)
 
-Sentences:
-"""
-        for i, (sec, txt) in enumerate(matches, 1):
-            evaluation_prompt += f"{i}. {txt.strip()}\n"
-        
-        evaluation_prompt += "\nRespond with the number only."
-
-        response = llm.invoke(evaluation_prompt)
-        result = response.content.strip() if hasattr(response, 'content') else str(response).strip()
-
-        number_match = re.search(r'\d+', result)
-        if number_match:
-            selected_idx = int(number_match.group()) - 1
-            if 0 <= selected_idx < len(matches):
-                sec, txt = matches[selected_idx]
-                seconds = float(sec)
-                minutes = int(seconds // 60)
-                remaining_seconds = int(seconds % 60)
-                time_str = f"{minutes}:{remaining_seconds:02d}" if minutes > 0 else f"{remaining_seconds}s"
-                return f"{time_str}: {txt.strip()}"
-    
-    except Exception as e:
-        print(f"[extract_best_time_and_text_with_ai] AI evaluation failed: {e}")
-    
-    # Fallback to first match if AI fails
-    sec, txt = matches[0]
+def format_time_and_text(sec: str, txt: str) -> str:
     seconds = float(sec)
     minutes = int(seconds // 60)
     remaining_seconds = int(seconds % 60)
     time_str = f"{minutes}:{remaining_seconds:02d}" if minutes > 0 else f"{remaining_seconds}s"
     return f"{time_str}: {txt.strip()}"
 
+def _parse_batched_selection(result: str):
+    """Parse {"doc": sentence} picks from the LLM, tolerating `doc: sentence` lines"""
+    picks = {}
+    json_match = re.search(r'\{.*\}', result, re.DOTALL)
+    if json_match:
+        try:
+            for doc_no, sentence_no in json.loads(json_match.group()).items():
+                picks[int(doc_no)] = int(sentence_no)
+            return picks
+        except (ValueError, TypeError, AttributeError):
+            picks = {}
+    for doc_no, sentence_no in re.findall(r'(\d+)\s*[:=]\s*(\d+)', result):
+        picks[int(doc_no)] = int(sentence_no)
+    return picks
+
+def select_best_times_batched(contents, question: str, llm=None):
+    """Pick the most relevant timestamped sentence for every document
+
+    Sentences are ranked locally with BM25. Only documents whose ranking is not
+    confident (margin below CHAT_TIMESTAMP_BM25_MIN_MARGIN) are sent to the LLM as a
+    tie-breaker, all together in a single prompt; when llm is None, the call fails or
+    a pick is missing, the BM25 choice is kept.
+    """
+    all_matches = [extract_timestamped_sentences(content) for content in contents]
+    selections = [0 if matches else None for matches in all_matches]
+    ambiguous = []
+
+    for i, matches in enumerate(all_matches):
+        if len(matches) < 2:
+            continue
+        selections[i], confidence = rank_sentences([txt for _, txt in matches], question)
+        if confidence < settings.CHAT_TIMESTAMP_BM25_MIN_MARGIN:
+            ambiguous.append(i)
+
+    picks = {}
+    if ambiguous and llm is not None:
+        try:
+            evaluation_prompt = f"""
+For each document below, select the sentence most relevant to the question.
+
+Question: {question}
+"""
+            for doc_no, i in enumerate(ambiguous, 1):
+                evaluation_prompt += f"\nDocument {doc_no}:\n"
+                for sentence_no, (_, txt) in enumerate(all_matches[i], 1):
+                    evaluation_prompt += f"{sentence_no}. {txt.strip()}\n"
+
+            evaluation_prompt += (
+                "\nRespond with a JSON object only, mapping each document number to the selected "
+                'sentence number, e.g. {"1": 2, "2": 1}.'
+            )
+
+            response = llm.invoke(evaluation_prompt)
+            result = response.content.strip() if hasattr(response, 'content') else str(response).strip()
+            picks = _parse_batched_selection(result)
+
+        except Exception as e:
+            print(f"[select_best_times_batched] AI evaluation failed: {e}")
+
+    for doc_no, i in enumerate(ambiguous, 1):
+        selected_idx = picks.get(doc_no, 0) - 1
+        if 0 <= selected_idx < len(all_matches[i]):
+            selections[i] = selected_idx
+
+    return [
+        format_time_and_text(*matches[idx]) if idx is not None else "No timestamped sentences found."
+        for matches, idx in zip(all_matches, selections)
+    ]
+
+def extract_best_time_and_text_with_ai(content: str, question: str, llm) -> str:
+    """Extracts the most relevant timestamped sentence from the content using AI"""
+    return select_best_times_batched([content], question, llm)[0]
+
 def extract_video_id_from_content(content: str) -> str:
     """Extract video ID from content filename like 'OA7LIkxp3_o_xxx.txt'"""
     video_pattern = r'([A-Za-z0-9_-]{11})_[a-f0-9]+\.txt'
@@ -71,6 +106,27 @@ def extract_video_id_from_content(content: str) -> str:
     return "No video ID found."
 
 def answer_question(question: str):
+    """Answer from the semantic cache when a near-duplicate question was answered before"""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return _answer_question(question)
+
+    try:
+        cached, normalized, embedding = semantic_answer_cache.lookup(question)
+    except Exception as e:
+        print(f"[answer_question] Semantic cache lookup failed (ignored): {e}")
+        return _answer_question(question)
+
+    if cached is not None:
+        print("[answer_question] Semantic cache hit.")
+        return {**cached, 'cached': True}
+
+    result = _answer_question(question)
+    # FALLBACK answers are also what a failed retrieval produces, so only KB answers are shared
+    if result.get('source_type') == 'KB':
+        semantic_answer_cache.store(normalized, embedding, result)
+    return result
+
+def _answer_question(question: str):
     retriever = get_kb_retriever()
     llm = get_llm()
 
@@ -91,8 +147,12 @@ def answer_question(question: str):
         unique_docs = []
         seen_content = set()
         
-        for doc in high_quality_docs:
-            time_and_text = extract_best_time_and_text_with_ai(doc.page_content, question, llm)
+        selection_llm = llm if settings.CHAT_TIMESTAMP_SELECTION_USE_LLM else None
+        selections = select_best_times_batched(
+            [doc.page_content for doc in high_quality_docs], question, selection_llm
+        )
+
+        for doc, time_and_text in zip(high_quality_docs, selections):
             if time_and_text not in seen_content:
                 seen_content.add(time_and_text)
                 unique_docs.append((doc, time_and_text))
@@ -111,7 +171,8 @@ def answer_question(question: str):
             'answer': answer,
             'source_type': 'KB',
             'documents_found': len(high_quality_docs),
-            'relevance_scores': relevance_scores[:5]
+            'relevance_scores': relevance_scores[:5],
+            'sources': [time_and_text for _, time_and_text in unique_docs]
         }
 
     else:
@@ -123,5 +184,6 @@ def answer_question(question: str):
             'answer': answer,
             'source_type': 'FALLBACK',
             'documents_found': 0,
-            'relevance_scores': relevance_scores[:5] if relevance_scores else []
+            'relevance_scores': relevance_scores[:5] if relevance_scores else [],
+            'sources': []
         }
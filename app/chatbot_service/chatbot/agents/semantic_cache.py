@@ -0,0 +1,100 @@
+# agents/semantic_cache.py
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from core.clients import get_client
+from core.config import settings
+from chatbot.tool.kb_sync_events import on_kb_sync_complete
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return re.sub(r'\s+', ' ', question).strip().lower().rstrip('?!.。 ')
+
+class SemanticAnswerCache:
+    """Answers keyed on question embeddings, reused for near-duplicate questions
+
+    Exact repeats of a normalized question are served without calling Bedrock at all;
+    otherwise the question is embedded and compared (cosine similarity) against every
+    cached question. Entries expire after ttl_seconds, the oldest are evicted beyond
+    max_entries, and the whole cache is dropped when a KB ingestion job completes.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, similarity_threshold: float, model_id: str):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.model_id = model_id
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # normalized question -> (expires_at, embedding, result)
+        self.keys = []
+        self.matrix = None
+
+    def embed(self, text: str) -> np.ndarray:
+        response = get_client("bedrock-runtime").invoke_model(
+            modelId=self.model_id,
+            body=json.dumps({"inputText": text}),
+            contentType="application/json",
+            accept="application/json"
+        )
+        vector = np.asarray(json.loads(response["body"].read())["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, question: str):
+        """Return (cached result or None, normalized question, embedding or None)"""
+        normalized = normalize_question(question)
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(normalized)
+            if entry and entry[0] > now:
+                return entry[2], normalized, entry[1]
+
+        embedding = self.embed(normalized)
+
+        with self.lock:
+            if self.matrix is None or not self.keys:
+                return None, normalized, embedding
+            similarities = self.matrix @ embedding
+            for idx in np.argsort(similarities)[::-1]:
+                if similarities[idx] < self.similarity_threshold:
+                    break
+                entry = self.entries.get(self.keys[idx])
+                if entry and entry[0] > now:
+                    return entry[2], normalized, embedding
+        return None, normalized, embedding
+
+    def store(self, normalized: str, embedding: np.ndarray, result: dict):
+        with self.lock:
+            now = time.time()
+            self.entries.pop(normalized, None)
+            self.entries[normalized] = (now + self.ttl_seconds, embedding, result)
+            for key in [k for k, entry in self.entries.items() if entry[0] <= now]:
+                del self.entries[key]
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._rebuild_index()
+
+    def clear(self, job_id: str = None):
+        with self.lock:
+            self.entries.clear()
+            self._rebuild_index()
+        print(f"[SemanticAnswerCache] Cleared after KB sync {job_id}")
+
+    def _rebuild_index(self):
+        self.keys = list(self.entries.keys())
+        self.matrix = np.vstack([entry[1] for entry in self.entries.values()]) if self.keys else None
+
+semantic_answer_cache = SemanticAnswerCache(
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+    similarity_threshold=settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    model_id=settings.SEMANTIC_CACHE_EMBEDDING_MODEL_ID
+)
+
+on_kb_sync_complete(semantic_answer_cache.clear)
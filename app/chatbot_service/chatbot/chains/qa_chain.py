@@ -1,20 +1,16 @@
 # chains/qa_chain.py
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_aws import ChatBedrock
-import boto3
+from functools import lru_cache
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from core.config import settings
+from core.clients import get_chat_model
 
+@lru_cache()
 def build_qa_chain():
-    """QA 체인 빌드"""
-    llm = ChatBedrock(
-        client=boto3.client("bedrock-runtime", region_name=settings.AWS_REGION),
-        model_id=settings.BEDROCK_MODEL_ID,
-        model_kwargs={"temperature": 0.0, "max_tokens": 4096}
-    )
+    """QA 체인 빌드 (프로세스당 한 번)"""
+    llm = get_chat_model(temperature=0.0, max_tokens=4096)
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a helpful assistant. Answer the question based on the provided context."),
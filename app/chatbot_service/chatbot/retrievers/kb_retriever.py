@@ -1,23 +1,29 @@
 # retrievers/kb_retriever.py
-import boto3
 import sys
 import os
-from langchain_aws import ChatBedrock
+from functools import lru_cache
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from core.config import settings
+from core.clients import get_client, get_chat_model
+from chatbot.retrievers.retrieval_cache import retrieval_cache, normalize_query
+
+NUMBER_OF_RESULTS = 5
 
 def get_llm():
-    return ChatBedrock(
-        client=boto3.client("bedrock-runtime", region_name=settings.AWS_REGION),
-        model_id=settings.BEDROCK_MODEL_ID,
-        model_kwargs={"temperature": 0.0, "max_tokens": 4096}
-    )
+    return get_chat_model(temperature=0.0, max_tokens=4096)
 
+@lru_cache()
 def get_kb_retriever():
-    bedrock_client = boto3.client("bedrock-agent-runtime", region_name=settings.AWS_REGION)
+    bedrock_client = get_client("bedrock-agent-runtime")
     
     def retrieve(query: str):
+        cache_key = (settings.BEDROCK_KB_ID, normalize_query(query), NUMBER_OF_RESULTS)
+        if settings.RETRIEVAL_CACHE_ENABLED:
+            cached = retrieval_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             response = bedrock_client.retrieve(
                 knowledgeBaseId=settings.BEDROCK_KB_ID,
@@ -26,7 +32,7 @@ def get_kb_retriever():
                 },
                 retrievalConfiguration={
                     "vectorSearchConfiguration": {
-                        "numberOfResults": 5
+                        "numberOfResults": NUMBER_OF_RESULTS
                     }
                 }
             )
@@ -44,7 +50,9 @@ def get_kb_retriever():
                     }
                 )
                 documents.append(doc)
-            
+
+            if settings.RETRIEVAL_CACHE_ENABLED:
+                retrieval_cache.set(cache_key, documents)
             return documents
             
         except Exception as e:
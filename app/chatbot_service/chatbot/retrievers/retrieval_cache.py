@@ -0,0 +1,72 @@
+# retrievers/retrieval_cache.py
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from core.config import settings
+from chatbot.tool.kb_sync_events import on_kb_sync_complete
+
+def normalize_query(query: str) -> str:
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+class RetrievalCache:
+    """LRU + TTL cache of KB retrieve results keyed on (kb_id, normalized query, numberOfResults)
+
+    Cleared whenever an ingestion job completes, since the KB content changed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, documents)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.time():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+            if entry:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, documents):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl_seconds, list(documents))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self, job_id: str = None):
+        with self.lock:
+            self.entries.clear()
+            self.invalidations += 1
+        print(f"[RetrievalCache] Cleared after KB sync {job_id}")
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.RETRIEVAL_CACHE_ENABLED,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations
+            }
+
+retrieval_cache = RetrievalCache(
+    max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS
+)
+
+on_kb_sync_complete(retrieval_cache.clear)
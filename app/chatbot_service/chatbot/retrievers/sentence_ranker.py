@@ -0,0 +1,64 @@
+# retrievers/sentence_ranker.py
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+def tokenize(text: str):
+    """Lowercased word tokens, plus character bigrams of non-ASCII words
+
+    The bigrams let Korean words match across attached particles
+    (e.g. "쿠버네티스는" still shares tokens with "쿠버네티스").
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2 and not word.isascii():
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def bm25_scores(sentences, question: str):
+    """BM25 score of each sentence for the question, using the sentences themselves as the corpus"""
+    docs = [tokenize(sentence) for sentence in sentences]
+    if not docs:
+        return []
+
+    avg_len = sum(len(doc) for doc in docs) / len(docs) or 1.0
+    doc_freq = Counter(token for doc in docs for token in set(doc))
+    query_tokens = set(tokenize(question))
+
+    scores = []
+    for doc in docs:
+        term_freq = Counter(doc)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_len)
+        score = 0.0
+        for token in query_tokens:
+            tf = term_freq.get(token)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[token] + 0.5) / (doc_freq[token] + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+def rank_sentences(sentences, question: str):
+    """Return (best index, confidence in [0, 1]) for the most relevant sentence
+
+    Confidence is the relative margin of the best score over the runner-up;
+    it is 0 when nothing matches the question and 1 when only one sentence does.
+    """
+    scores = bm25_scores(sentences, question)
+    if not scores:
+        return 0, 0.0
+
+    best_idx = max(range(len(scores)), key=lambda i: scores[i])
+    best = scores[best_idx]
+    if best <= 0:
+        return best_idx, 0.0
+
+    runner_up = max((score for i, score in enumerate(scores) if i != best_idx), default=0.0)
+    return best_idx, (best - runner_up) / best
@@ -5,6 +5,7 @@ from typing import List
 from pydantic import BaseModel
 import datetime
 from chatbot.agents.bedrock_agent import answer_question
+from chatbot.retrievers.retrieval_cache import retrieval_cache
 from chatbot.tool.youtube_lambda import process_user_job
 
 # Pydantic model definitions
@@ -35,6 +36,8 @@ class ChatResponse(BaseModel):
     source_type: str = None  # "KB" or "FALLBACK"
     documents_found: int = 0
     relevance_scores: list = []
+    sources: list = []
+    cached: bool = False
 
 @router.post("/api/chat", response_model=ChatResponse)
 async def chat(request: QuestionRequest):
@@ -47,11 +50,15 @@ async def chat(request: QuestionRequest):
             source_type = result.get('source_type', 'UNKNOWN')
             documents_found = result.get('documents_found', 0)
             relevance_scores = result.get('relevance_scores', [])
+            sources = result.get('sources', [])
+            cached = result.get('cached', False)
         else:
             answer = str(result)
             source_type = 'UNKNOWN'
             documents_found = 0
             relevance_scores = []
+            sources = []
+            cached = False
 
         chat_history.append(ChatMessage(
             role="user",
@@ -69,7 +76,9 @@ async def chat(request: QuestionRequest):
             success=True,
             source_type=source_type,
             documents_found=documents_found,
-            relevance_scores=relevance_scores
+            relevance_scores=relevance_scores,
+            sources=sources,
+            cached=cached
         )
     except Exception as e:
         return ChatResponse(
@@ -78,6 +87,10 @@ async def chat(request: QuestionRequest):
             error=str(e)
         )
 
+@router.get("/api/cache-stats")
+async def get_cache_stats():
+    return {"retrieval": retrieval_cache.stats()}
+
 @router.get("/api/chat-history")
 async def get_chat_history():
     return chat_history
@@ -0,0 +1,76 @@
+#tool/kb_sync_events.py
+import threading
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from core.config import settings
+from core.clients import get_client
+
+_lock = threading.Lock()
+_listeners = []
+_completed_job_ids = set()
+_watcher = None
+
+def on_kb_sync_complete(listener):
+    """Register listener(job_id) to run once for every ingestion job seen as COMPLETE"""
+    with _lock:
+        _listeners.append(listener)
+    return listener
+
+def mark_ingestion_complete(job_id: str) -> bool:
+    """Notify listeners about a completed ingestion job; returns False if it was already handled"""
+    with _lock:
+        if job_id in _completed_job_ids:
+            return False
+        _completed_job_ids.add(job_id)
+        listeners = list(_listeners)
+
+    for listener in listeners:
+        try:
+            listener(job_id)
+        except Exception as e:
+            print(f"KB sync listener failed for job {job_id}: {e}")
+    return True
+
+def poll_completed_ingestion_jobs():
+    """Mark the most recent COMPLETE ingestion jobs of the data source as seen"""
+    response = get_client("bedrock-agent").list_ingestion_jobs(
+        knowledgeBaseId=settings.BEDROCK_KB_ID,
+        dataSourceId=settings.BEDROCK_DS_ID,
+        filters=[{"attribute": "STATUS", "operator": "EQ", "values": ["COMPLETE"]}],
+        sortBy={"attribute": "STARTED_AT", "order": "DESCENDING"},
+        maxResults=10
+    )
+    for job in response.get("ingestionJobSummaries", []):
+        mark_ingestion_complete(job["ingestionJobId"])
+
+def start_kb_sync_watcher():
+    """Poll for completed ingestion jobs every KB_SYNC_POLL_SECONDS in a daemon thread
+
+    /api/kb-status only reaches the replica that serves it, and syncs can finish without
+    anyone asking; polling lets every replica invalidate its caches on its own.
+    """
+    global _watcher
+    if _watcher is not None or settings.KB_SYNC_POLL_SECONDS <= 0:
+        return
+    if not settings.BEDROCK_KB_ID or not settings.BEDROCK_DS_ID:
+        return
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(settings.KB_SYNC_POLL_SECONDS):
+            try:
+                poll_completed_ingestion_jobs()
+            except Exception as e:
+                print(f"KB sync poll failed (ignored): {e}")
+
+    # Jobs that completed before startup are not news to this process's empty caches
+    try:
+        poll_completed_ingestion_jobs()
+    except Exception as e:
+        print(f"KB sync poll failed (ignored): {e}")
+
+    _watcher = threading.Thread(target=run, name="kb-sync-watcher", daemon=True)
+    _watcher.start()
@@ -1,21 +1,25 @@
 #tool/wait_until_kb_sync_complete.py
-import boto3
 import time
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from core.config import settings
+from core.clients import get_client
+from chatbot.tool.kb_sync_events import mark_ingestion_complete
 
 def get_ingestion_job_status(job_id: str) -> str:
     try:
-        bedrock_client = boto3.client("bedrock-agent", region_name=settings.AWS_REGION)
+        bedrock_client = get_client("bedrock-agent")
         response = bedrock_client.get_ingestion_job(
             knowledgeBaseId=settings.BEDROCK_KB_ID,
             dataSourceId=settings.BEDROCK_DS_ID,
             ingestionJobId=job_id
         )
-        return response["ingestionJob"]["status"]
+        status = response["ingestionJob"]["status"]
+        if status == "COMPLETE":
+            mark_ingestion_complete(job_id)
+        return status
     except Exception as e:
         print(f"Job status search failed: {e}")
         return "UNKNOWN"
@@ -0,0 +1,53 @@
+# core/clients.py
+import threading
+
+import boto3
+from botocore.config import Config
+
+from core.config import settings
+
+_lock = threading.Lock()
+_clients = {}
+_chat_models = {}
+
+def get_client(service_name: str):
+    """Process-wide boto3 client for a service, created on first use
+
+    boto3 clients are thread-safe once constructed, so every request shares one
+    client (and its connection pool) instead of resolving credentials and
+    endpoints and opening new TLS connections each time.
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = boto3.client(
+                    service_name,
+                    region_name=settings.AWS_REGION,
+                    config=Config(
+                        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": settings.AWS_MAX_RETRY_ATTEMPTS, "mode": "adaptive"}
+                    )
+                )
+                _clients[service_name] = client
+    return client
+
+def get_chat_model(temperature: float = 0.0, max_tokens: int = 4096):
+    """Shared ChatBedrock instance for the configured model and generation settings"""
+    from langchain_aws import ChatBedrock
+
+    key = (settings.BEDROCK_MODEL_ID, temperature, max_tokens)
+    llm = _chat_models.get(key)
+    if llm is None:
+        client = get_client("bedrock-runtime")
+        with _lock:
+            llm = _chat_models.get(key)
+            if llm is None:
+                llm = ChatBedrock(
+                    client=client,
+                    model_id=settings.BEDROCK_MODEL_ID,
+                    model_kwargs={"temperature": temperature, "max_tokens": max_tokens}
+                )
+                _chat_models[key] = llm
+    return llm
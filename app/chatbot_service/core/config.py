@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     AWS_REGION: str = "us-west-2"
     AWS_S3_BUCKET: Optional[str] = None
     S3_PREFIX: Optional[str] = None
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_MAX_RETRY_ATTEMPTS: int = 3
 
     # Bedrock 설정 (bedrock_chatbot에서 통합)
     BEDROCK_KB_ID: Optional[str] = None
@@ -27,6 +29,23 @@ class Settings(BaseSettings):
     BEDROCK_MAX_TOKENS: int = 4000
     YOUTUBE_LAMBDA_NAME: Optional[str] = None
 
+    # 챗봇 설정
+    CHAT_TIMESTAMP_SELECTION_USE_LLM: bool = True
+    CHAT_TIMESTAMP_BM25_MIN_MARGIN: float = 0.2
+
+    # 시맨틱 답변 캐시 설정
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_EMBEDDING_MODEL_ID: str = "amazon.titan-embed-text-v2:0"
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    SEMANTIC_CACHE_TTL_SECONDS: int = 86400
+
+    # KB 검색 캐시 설정
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = 512
+    RETRIEVAL_CACHE_TTL_SECONDS: int = 600
+    KB_SYNC_POLL_SECONDS: int = 60
+
     # Polly 설정
     POLLY_VOICE_ID: str = "Seoyeon"
 
@@ -1,9 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from chatbot.routers.chat_router import router as chat_router_router
+from chatbot.chains.qa_chain import build_qa_chain
+from chatbot.retrievers.kb_retriever import get_kb_retriever, get_llm
+from chatbot.tool.kb_sync_events import start_kb_sync_watcher
 
 app = FastAPI()
 
+@app.on_event("startup")
+def warm_up_clients():
+    """Build the shared Bedrock clients, LLM and QA chain once, before the first chat request"""
+    try:
+        get_llm()
+        get_kb_retriever()
+        build_qa_chain()
+    except Exception as e:
+        print(f"Client warm-up failed (will retry on first request): {e}")
+    start_kb_sync_watcher()
+
 @app.get("/")
 def root():
     return {"message": "Hello from chatbot_service!"}
@@ -1,9 +1,12 @@
 # app/agents/caption_agent.py
 
+import threading
 import requests
 from langchain_core.runnables import Runnable
 from core.config import settings
 from analyze.services.state_manager import state_manager
+from analyze.services.caption_store import caption_store
+from analyze.services.youtube_metadata_service import youtube_metadata_service
 from s3.services.user_s3_service import user_s3_service
 import logging
 
@@ -14,6 +17,10 @@ class CaptionAgent(Runnable):
     def __init__(self):
         self.api_key = settings.VIDCAP_API_KEY
         self.api_url = "https://vidcap.xyz/api/v1/youtube/caption"
+        self.locale = settings.CAPTION_LOCALE
+        self.timeout = settings.VIDCAP_TIMEOUT_SECONDS
+        # requests.Session is not thread-safe; each thread keeps its own connection pool
+        self._local = threading.local()
 
     def invoke(self, state: dict, config=None):
         youtube_url = state.get("youtube_url")
@@ -29,19 +36,11 @@ class CaptionAgent(Runnable):
                 logger.warning(f"Failed to update progress (reason: {e})")
 
         try:
-            response = requests.get(
-                self.api_url,
-                params={"url": youtube_url, "locale": "ko"},
-                headers={"Authorization": f"Bearer {self.api_key}"}
-            )
-            response.raise_for_status()
-
-            caption = response.json().get("data", {}).get("content", "")
-            if not caption:
-                caption = "Caption not found."
+            caption = self._fetch_caption(youtube_url)
+            caption_ok = caption != "Caption not found."
 
             # Upload to S3 if valid
-            if job_id and user_id and caption != "Caption not found.":
+            if job_id and user_id and caption_ok:
                 try:
                     s3_key = f"captions/{user_id}/{job_id}_caption.txt"
                     user_s3_service.upload_text_content(s3_key, caption)
@@ -50,9 +49,39 @@ class CaptionAgent(Runnable):
                     logger.warning(f"Failed to upload caption to S3 (reason: {e})")
 
             logger.info(f"Caption extraction completed. Length: {len(caption)}")
-            return {**state, "caption": caption}
+            return {**state, "caption": caption, "caption_ok": caption_ok}
 
         except Exception as e:
             error_msg = f"Caption extraction failed: {str(e)}"
             logger.error(error_msg)
-            return {**state, "caption": error_msg}
+            return {**state, "caption": error_msg, "caption_ok": False}
+
+    def _fetch_caption(self, youtube_url: str) -> str:
+        """Return the caption from the shared caption store, calling vidcap only on a miss"""
+        video_id = youtube_metadata_service.extract_video_id(youtube_url)
+
+        if video_id:
+            cached = caption_store.get(video_id, self.locale)
+            if cached:
+                logger.info(f"Caption cache hit for video {video_id} (found={cached.get('found')})")
+                return cached["caption"] if cached.get("found") else "Caption not found."
+
+        response = self._session().get(
+            self.api_url,
+            params={"url": youtube_url, "locale": self.locale},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        caption = response.json().get("data", {}).get("content", "")
+        if video_id:
+            caption_store.put(video_id, self.locale, caption or None)
+
+        return caption or "Caption not found."
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
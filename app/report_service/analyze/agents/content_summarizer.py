@@ -1,14 +1,21 @@
 import os
+import re
 import boto3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
 from langchain_aws import ChatBedrock
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from core.config import settings
 from analyze.services.state_manager import state_manager
+from analyze.services.chunk_summary_cache import chunk_summary_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+TIMESTAMP_PATTERN = re.compile(r'^\[?\(?\d{1,2}:\d{2}(?::\d{2})?')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。])\s+')
+
 
 class SummaryAgent(Runnable):
     """Agent that summarizes a YouTube caption into key insights."""
@@ -38,6 +45,27 @@ class SummaryAgent(Runnable):
             ("human", "Here is the YouTube caption to summarize:\n\n{caption}")
         ])
 
+        self.chunk_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are summarizing one consecutive part of a long YouTube video caption.
+Write dense notes that keep every key point, argument, number, name and time marker in this part.
+Do not add an introduction or conclusion. Answer in the language of the caption."""),
+            ("human", "Part {index} of {total}:\n\n{text}")
+        ])
+
+        self.reduce_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are merging notes taken from consecutive parts of a long YouTube video.
+Combine them into one set of notes in chronological order. Remove repetition but keep every
+distinct key point, number, name and time marker. Answer in the language of the notes."""),
+            ("human", "{text}")
+        ])
+
+        self.single_pass_tokens = settings.SUMMARY_SINGLE_PASS_TOKENS
+        self.chunk_tokens = settings.SUMMARY_CHUNK_TOKENS
+        self.reduce_fanin = max(2, settings.SUMMARY_REDUCE_FANIN)
+        # Per-agent fan-out pool, shared across jobs (see core.io_executor.IOExecutor)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, settings.SUMMARY_MAP_CONCURRENCY),
+                                           thread_name_prefix="summary")
+
     def invoke(self, state: dict, config=None):
         caption = state.get("caption", "")
         job_id = state.get("job_id")
@@ -51,85 +79,172 @@ class SummaryAgent(Runnable):
             except Exception as e:
                 logger.warning(f"Failed to update state (ignored): {e}")
 
-        if not caption or "No caption detected" in caption or "Caption extraction failed" in caption:
+        if (not state.get("caption_ok", True) or not caption
+                or "No caption detected" in caption or "Caption extraction failed" in caption):
             logger.warning("Invalid or missing caption.")
-            return {**state, "summary": "No valid caption found. Caption may be missing or failed to extract."}
+            return {**state, "summary": "No valid caption found. Caption may be missing or failed to extract.",
+                    "summary_ok": False}
 
         try:
-            processed_caption = self._preprocess_caption(caption)
-
-            response = self.llm.invoke(
-                self.prompt.format_messages(caption=processed_caption)
-            )
-            summary = response.content.strip()
-
-            if len(summary) < 500:
-                logger.warning("Summary appears too short. Attempting enhancement...")
-                followup_prompt = ChatPromptTemplate.from_messages([
-                    ("system", "The initial summary was too short. Please provide a more detailed response."),
-                    ("human", f"Original caption:\n{processed_caption}\n\nInitial summary:\n{summary}\n\nPlease elaborate further.")
-                ])
-                response = self.llm.invoke(followup_prompt.format_messages())
-                summary = response.content.strip()
+            summary = self.summarize(caption, sink=self._progress_sink(job_id))
 
             logger.info(f"Summary generation completed. Length: {len(summary)}")
-            return {**state, "summary": summary}
+            return {**state, "summary": summary, "summary_ok": True}
 
         except Exception as e:
             error_msg = f"Error during summary generation: {str(e)}"
             logger.error(error_msg)
-            return {**state, "summary": error_msg}
+            return {**state, "summary": error_msg, "summary_ok": False}
+
+    def summarize(self, caption: str, sink: Optional[Callable[[dict], None]] = None) -> str:
+        """Summarize a caption, streaming tokens to sink as they arrive when one is given
+
+        The sink receives `summary_delta` events with the new text, and a
+        `summary_reset` event before the elaboration pass replaces a short draft.
+        """
+        processed_caption = self._preprocess_caption(caption)
+
+        summary = self._complete(self.prompt.format_messages(caption=processed_caption), sink)
+
+        if len(summary) < 500:
+            logger.warning("Summary appears too short. Attempting enhancement...")
+            followup_prompt = ChatPromptTemplate.from_messages([
+                ("system", "The initial summary was too short. Please provide a more detailed response."),
+                ("human", f"Original caption:\n{processed_caption}\n\nInitial summary:\n{summary}\n\nPlease elaborate further.")
+            ])
+            if sink:
+                sink({"type": "summary_reset", "reason": "elaborating"})
+            summary = self._complete(followup_prompt.format_messages(), sink)
+
+        return summary
+
+    def _complete(self, messages: List, sink: Optional[Callable[[dict], None]]) -> str:
+        """Run one LLM call, through Bedrock's streaming API when a sink is attached"""
+        if not sink or not settings.SUMMARY_STREAMING:
+            return self.llm.invoke(messages).content.strip()
+
+        parts = []
+        buffer = ""
+        sent_any = False
+        for chunk in self.llm.stream(messages):
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            if not text:
+                continue
+            parts.append(text)
+            buffer += text
+            # First tokens go out immediately; after that they are batched to keep the channel quiet
+            if not sent_any or len(buffer) >= settings.SUMMARY_STREAM_FLUSH_CHARS:
+                sink({"type": "summary_delta", "text": buffer})
+                buffer = ""
+                sent_any = True
+        if buffer:
+            sink({"type": "summary_delta", "text": buffer})
+
+        return "".join(parts).strip()
+
+    def _progress_sink(self, job_id: Optional[str]) -> Optional[Callable[[dict], None]]:
+        """Sink that publishes summary tokens on the job's progress channel"""
+        if not job_id or not settings.SUMMARY_STREAMING:
+            return None
+
+        failed = False
+
+        def sink(event: dict):
+            nonlocal failed
+            if failed:
+                return
+            try:
+                state_manager.publish(job_id, event)
+            except Exception as e:
+                failed = True
+                logger.warning(f"Failed to publish summary tokens (ignored): {e}")
+
+        return sink
 
     def _preprocess_caption(self, caption: str) -> str:
-        """Trims and extracts the most important parts of the caption for summarization."""
-        if len(caption) <= 6000:
+        """Condense a long caption with chunked map-reduce so the final summary sees all of it"""
+        if self._estimate_tokens(caption) <= self.single_pass_tokens:
             return caption
 
-        logger.info(f"Caption too long ({len(caption)} chars). Extracting highlights...")
+        chunks = self._split_caption(caption)
+        logger.info(f"Caption too long ({len(caption)} chars). Summarizing {len(chunks)} chunks...")
 
-        sentences = caption.replace('\n', ' ').split('.')
+        notes = self._map_parallel([
+            (self.chunk_prompt, {"index": i + 1, "total": len(chunks), "text": chunk})
+            for i, chunk in enumerate(chunks)
+        ])
 
-        importance_keywords = [
-            'summary', 'key point', 'insight', 'finding', 'result', 'conclusion',
-            'first', 'second', 'third', 'main',
-            'score', 'criteria', 'impact', 'outcome', 'recommendation', 'evidence',
-            'context', 'reference', 'trend'
-        ]
+        # Merge neighbouring notes level by level until they fit into one summary call
+        level = 1
+        while len(notes) > 1 and self._estimate_tokens("\n\n".join(notes)) > self.single_pass_tokens:
+            groups = [notes[i:i + self.reduce_fanin] for i in range(0, len(notes), self.reduce_fanin)]
+            logger.info(f"Reduce level {level}: {len(notes)} notes -> {len(groups)}")
+            notes = self._map_parallel([(self.reduce_prompt, {"text": "\n\n".join(group)}) for group in groups])
+            level += 1
 
-        important_sentences = []
-        regular_sentences = []
+        processed = "\n\n".join(f"[Part {i + 1}/{len(notes)}]\n{note}" for i, note in enumerate(notes))
+        logger.info(f"Caption preprocessing complete: {len(caption)} -> {len(processed)} chars")
+        return processed
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
+    def _map_parallel(self, calls: List[tuple]) -> List[str]:
+        """Run (prompt, variables) LLM calls on the shared pool, preserving order"""
+        futures = [self.executor.submit(self._summarize_part, prompt, variables) for prompt, variables in calls]
+        return [future.result() for future in futures]
+
+    def _summarize_part(self, prompt: ChatPromptTemplate, variables: dict) -> str:
+        """Summarize one chunk or group of notes, reusing a cached result for identical text
+
+        Errors propagate, so a partial failure fails the summary (summary_ok=False)
+        instead of producing a degraded report that would be cached.
+        """
+        cache_key = chunk_summary_cache.build_key(prompt.pretty_repr(), variables["text"])
+        cached = chunk_summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        summary = self.llm.invoke(prompt.format_messages(**variables)).content.strip()
+        chunk_summary_cache.put(cache_key, summary)
+        return summary
+
+    def _split_caption(self, caption: str) -> List[str]:
+        """Pack whole timestamp lines and sentences into chunks of at most chunk_tokens"""
+        units = []
+        for line in caption.splitlines():
+            line = line.strip()
+            if not line:
                 continue
-            score = sum(1 for keyword in importance_keywords if keyword.lower() in sentence.lower())
-            if score > 0:
-                important_sentences.append((score, sentence))
+            if TIMESTAMP_PATTERN.match(line):
+                units.append(line)
             else:
-                regular_sentences.append(sentence)
-
-        important_sentences.sort(key=lambda x: x[0], reverse=True)
-
-        result_sentences = []
-        result_sentences.extend(sentences[:10])
-        result_sentences.extend([s[1] for s in important_sentences[:30]])
-
-        step = max(1, len(regular_sentences) // 20)
-        result_sentences.extend(regular_sentences[::step][:20])
-        result_sentences.extend(sentences[-10:])
-
-        seen = set()
-        final_sentences = []
-        for sentence in result_sentences:
-            if sentence not in seen and sentence.strip():
-                seen.add(sentence)
-                final_sentences.append(sentence)
-
-        processed = '. '.join(final_sentences)
-
-        if len(processed) > 6000:
-            processed = processed[:6000] + "..."
-
-        logger.info(f"Caption preprocessing complete: {len(caption)} -> {len(processed)} chars")
-        return processed
+                units.extend(s for s in SENTENCE_BOUNDARY.split(line) if s.strip())
+
+        chunks = []
+        current = []
+        current_tokens = 0
+        for unit in units:
+            unit_tokens = self._estimate_tokens(unit)
+            if unit_tokens > self.chunk_tokens:
+                # A single run-on unit without boundaries: fall back to a hard split
+                step = max(1, len(unit) * self.chunk_tokens // unit_tokens)
+                pieces = [unit[i:i + step] for i in range(0, len(unit), step)]
+            else:
+                pieces = [unit]
+
+            for piece in pieces:
+                piece_tokens = self._estimate_tokens(piece)
+                if current and current_tokens + piece_tokens > self.chunk_tokens:
+                    chunks.append("\n".join(current))
+                    current = []
+                    current_tokens = 0
+                current.append(piece)
+                current_tokens += piece_tokens
+
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count: ~4 ASCII characters per token, one token per other character (e.g. Hangul)"""
+        ascii_chars = sum(1 for c in text if ord(c) < 128)
+        return ascii_chars // 4 + (len(text) - ascii_chars)
@@ -44,8 +44,10 @@ class ReportAgent(Runnable):
             return {**state, "report_result": self._create_error_report("Summary not available.")}
 
         try:
-            logger.info("Structuring summary into report sections...")
-            structured_sections = self._structure_summary(summary)
+            structured_sections = state.get("structured_sections")
+            if structured_sections is None:
+                logger.info("Structuring summary into report sections...")
+                structured_sections = self._structure_summary(summary)
 
             logger.info(f"Merging {len(visual_sections)} visual insights into report...")
             final_sections = self._merge_visualizations(structured_sections, visual_sections)
@@ -71,6 +73,19 @@ class ReportAgent(Runnable):
             logger.error(f"Report generation failed: {str(e)}")
             return {**state, "report_result": self._create_error_report(str(e))}
 
+    def structure(self, state: dict, config=None) -> dict:
+        """Graph branch that structures the summary in parallel with visualization.
+
+        Only the structured_sections update is returned so it can be joined safely
+        with the visual branch before invoke() merges both.
+        """
+        summary = state.get("summary", "")
+        if not summary:
+            return {"structured_sections": []}
+
+        logger.info("Structuring summary into report sections...")
+        return {"structured_sections": self._structure_summary(summary)}
+
     def _structure_summary(self, summary: str) -> List[Dict[str, Any]]:
         """Convert summary into structured report sections using LLM"""
         prompt = ChatPromptTemplate.from_messages([
@@ -1,7 +1,9 @@
 import os
 import json
+import time
 import boto3
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional
 from langchain_aws import ChatBedrock
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
@@ -21,8 +23,13 @@ class SmartVisualAgent(Runnable):
             model_id=settings.BEDROCK_MODEL_ID,
             model_kwargs={"temperature": 0.7, "max_tokens": settings.BEDROCK_MAX_TOKENS}
         )
+        self.max_concurrency = max(1, settings.VISUAL_MAX_CONCURRENCY)
+        self.opportunity_timeout = settings.VISUAL_TIMEOUT_SECONDS
+        # Per-agent fan-out pool, shared across jobs (see core.io_executor.IOExecutor)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="visual")
 
     def invoke(self, state: dict, config=None) -> dict:
+        """Runs as a parallel graph branch, so only the visual_sections update is returned."""
         summary = state.get("summary", "")
         job_id = state.get("job_id")
         user_id = state.get("user_id")
@@ -37,7 +44,7 @@ class SmartVisualAgent(Runnable):
 
         if not summary or len(summary) < 100:
             logger.warning("Invalid or too short summary. Skipping visualization.")
-            return {**state, "visual_sections": []}
+            return {"visual_sections": []}
 
         try:
             logger.info("Step 1: Analyzing context for visualization opportunities...")
@@ -45,15 +52,14 @@ class SmartVisualAgent(Runnable):
 
             if not context or "error" in context:
                 logger.error(f"Failed to extract visualization context: {context}")
-                return {**state, "visual_sections": []}
+                return {"visual_sections": []}
 
-            logger.info(f"Step 2: Generating {len(context.get('visualization_opportunities', []))} visual sections")
+            opportunities = context.get('visualization_opportunities', [])
+            logger.info(f"Step 2: Generating {len(opportunities)} visual sections")
+            visualizations = self._generate_visualizations(context, opportunities)
             visual_sections = []
 
-            for i, opportunity in enumerate(context.get('visualization_opportunities', [])):
-                logger.info(f"Generating visualization {i + 1}...")
-                visualization = self._generate_smart_visualization(context, opportunity)
-
+            for i, (opportunity, visualization) in enumerate(zip(opportunities, visualizations)):
                 if visualization and "error" not in visualization:
                     position = self._find_best_position(summary, opportunity)
                     visual_section = {
@@ -72,11 +78,11 @@ class SmartVisualAgent(Runnable):
                     logger.warning(f"Visualization {i + 1} generation failed.")
 
             logger.info(f"Completed generation of {len(visual_sections)} visual sections.")
-            return {**state, "visual_sections": visual_sections}
+            return {"visual_sections": visual_sections}
 
         except Exception as e:
             logger.error(f"Visualization generation failed: {str(e)}")
-            return {**state, "visual_sections": []}
+            return {"visual_sections": []}
 
     def _analyze_context(self, summary: str) -> Dict[str, Any]:
         prompt = ChatPromptTemplate.from_messages([
@@ -101,6 +107,52 @@ Ensure the response is a single valid JSON object.
             logger.error(f"Context analysis failed: {e}")
             return {"error": str(e)}
 
+    def _generate_visualizations(self, context: Dict[str, Any],
+                                 opportunities: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Generate one visualization per opportunity, keeping the input order.
+
+        Up to VISUAL_MAX_CONCURRENCY calls run at once across all jobs. Each call gets
+        VISUAL_TIMEOUT_SECONDS from the moment it starts running, so time spent queued
+        behind other jobs does not count against it; a call that overruns yields None
+        instead of holding up the rest of the report.
+        """
+        if not opportunities:
+            return []
+
+        started: Dict[int, float] = {}
+
+        def run(opportunity: Dict[str, Any], index: int) -> Dict[str, Any]:
+            started[index] = time.monotonic()
+            return self._safe_generate(context, opportunity, index)
+
+        pending = {
+            self.executor.submit(run, opportunity, i): i
+            for i, opportunity in enumerate(opportunities)
+        }
+        results: List[Optional[Dict[str, Any]]] = [None] * len(opportunities)
+
+        while pending:
+            deadlines = [started[i] + self.opportunity_timeout for i in pending.values() if i in started]
+            step = min(deadlines) - time.monotonic() if deadlines else self.opportunity_timeout
+            done, _ = wait(list(pending), timeout=max(step, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+
+            now = time.monotonic()
+            for future, i in list(pending.items()):
+                if i in started and now - started[i] >= self.opportunity_timeout:
+                    pending.pop(future)
+                    logger.warning(f"Visualization {i + 1} did not finish within {self.opportunity_timeout}s.")
+        return results
+
+    def _safe_generate(self, context: Dict[str, Any], opportunity: Dict[str, Any], index: int) -> Dict[str, Any]:
+        logger.info(f"Generating visualization {index + 1}...")
+        try:
+            return self._generate_smart_visualization(context, opportunity)
+        except Exception as e:
+            logger.error(f"Visualization {index + 1} raised an error: {e}")
+            return {"error": str(e)}
+
     def _generate_smart_visualization(self, context: Dict[str, Any], opportunity: Dict[str, Any]) -> Dict[str, Any]:
         # This function would follow the same format as the _analyze_context using another prompt
         # Due to size constraints, it can be implemented similarly
@@ -3,12 +3,16 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict
 import requests
 
+from core.io_executor import io_executor
+
 security = HTTPBearer()
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
     token = credentials.credentials
     try:
-        response = requests.post(
+        response = await io_executor.run(
+            "http",
+            requests.post,
             "http://auth-service.test.svc.cluster.local/auth/verify-token",
             headers={"Authorization": f"Bearer {token}"}
         )
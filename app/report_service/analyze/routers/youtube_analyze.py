@@ -1,13 +1,20 @@
 # app/analyze/routers/youtube_analyze.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Optional
 
 from analyze.core.auth import get_current_user
-from database.core.database import get_db
+from database.core.database import get_db, get_async_db, get_async_sessionmaker
+from database.core.pagination import InvalidCursorError
 from analyze.services.youtube_analyze_service import youtube_reporter_service
+from analyze.services.state_manager import state_manager
+from analyze.services.progress_stream import job_event_stream, TERMINAL_STATUSES
 from database.services.database_service import database_service
 from analyze.models.youtube_analyze import YouTubeReporterRequest, YouTubeReporterResponse
+from worker.services.job_queue import QueueFullError
+from core.io_executor import io_executor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,24 +22,10 @@ logger = logging.getLogger(__name__)
 #router = APIRouter(prefix="/analyze", tags=["YouTube Reporter"])
 router = APIRouter(tags=["YouTube Reporter"])
 
-async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, db: Session):
-    try:
-        await youtube_reporter_service.process_youtube_analysis(
-            job_id=job_id,
-            user_id=user_id,
-            youtube_url=youtube_url,
-            db=db
-        )
-    except Exception as e:
-        logger.error(f"Background YouTube analysis failed: {job_id} - {str(e)}")
-
-
 @router.post("/youtube", response_model=YouTubeReporterResponse)
 async def create_youtube_analysis(
         request: YouTubeReporterRequest,
-        background_tasks: BackgroundTasks,
-        current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        current_user: dict = Depends(get_current_user)
 ):
     """
     Submit YouTube video for analysis and generate smart visualization report.
@@ -47,16 +40,7 @@ async def create_youtube_analysis(
 
         job_id = await youtube_reporter_service.create_analysis_job(
             user_id=user_id,
-            youtube_url=youtube_url,
-            db=db
-        )
-
-        background_tasks.add_task(
-            run_youtube_analysis,
-            job_id=job_id,
-            user_id=user_id,
-            youtube_url=youtube_url,
-            db=db
+            youtube_url=youtube_url
         )
 
         return YouTubeReporterResponse(
@@ -66,6 +50,13 @@ async def create_youtube_analysis(
             estimated_time="2-5 minutes"
         )
 
+    except QueueFullError as e:
+        logger.warning(f"YouTube Reporter analysis rejected by admission control: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"YouTube Reporter analysis request failed: {str(e)}")
         raise HTTPException(
@@ -78,7 +69,7 @@ async def create_youtube_analysis(
 async def get_analysis_status(
         job_id: str,
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check status of YouTube Reporter analysis job.
@@ -88,12 +79,23 @@ async def get_analysis_status(
     try:
         user_id = current_user["user_id"]
 
-        job = database_service.get_job_by_id(db, job_id, user_id)
+        # Tracked jobs are answered from the progress store without touching Postgres
+        progress_info = youtube_reporter_service.get_job_progress(job_id)
+        if progress_info.get("user_id") == user_id and progress_info.get("status"):
+            return {
+                "job_id": job_id,
+                "status": progress_info["status"],
+                "progress": progress_info.get("progress", 0),
+                "message": progress_info.get("message", f"Status: {progress_info['status']}"),
+                "created_at": progress_info.get("created_at"),
+                "completed_at": progress_info.get("completed_at"),
+                "input_data": progress_info.get("input_data", {})
+            }
+
+        job = await database_service.get_job_by_id_async(db, job_id, user_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found.")
 
-        progress_info = youtube_reporter_service.get_job_progress(job_id)
-
         return {
             "job_id": job_id,
             "status": job.status,
@@ -111,11 +113,69 @@ async def get_analysis_status(
         raise HTTPException(status_code=500, detail=f"Failed to check job status: {str(e)}")
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_events(
+        job_id: str,
+        request: Request,
+        current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream progress and finished report sections of a YouTube Reporter job as Server-Sent Events.
+
+    Emits a `snapshot` event first, then `progress`, `node` and `section` events
+    as the workflow advances, and closes after a `completed` or `failed` event.
+
+    - **job_id**: Job ID
+    """
+    try:
+        user_id = current_user["user_id"]
+
+        # Subscribe before reading the snapshot so no event is lost in between
+        subscription = state_manager.subscribe(job_id)
+        try:
+            progress_info = youtube_reporter_service.get_job_progress(job_id)
+            if progress_info.get("user_id") == user_id and progress_info.get("status"):
+                snapshot = {"job_id": job_id, **progress_info}
+            else:
+                # Short-lived session: a request-scoped one would hold a pooled connection for the whole stream
+                async with get_async_sessionmaker()() as db:
+                    job = await database_service.get_job_by_id_async(db, job_id, user_id)
+                if not job:
+                    raise HTTPException(status_code=404, detail="Job not found.")
+                snapshot = {
+                    "job_id": job_id,
+                    "status": job.status,
+                    "progress": progress_info.get("progress", 0),
+                    "message": progress_info.get("message", f"Status: {job.status}"),
+                    "created_at": job.created_at.isoformat(),
+                    "completed_at": job.completed_at.isoformat() if job.completed_at else None
+                }
+        except Exception:
+            subscription.close()
+            raise
+
+        if snapshot["status"] in TERMINAL_STATUSES:
+            subscription.close()
+            subscription = None
+
+        return StreamingResponse(
+            job_event_stream(request, snapshot, subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to open job event stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to open job event stream: {str(e)}")
+
+
 @router.get("/jobs/{job_id}/result")
 async def get_analysis_result(
         job_id: str,
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieve YouTube Reporter analysis result.
@@ -125,7 +185,7 @@ async def get_analysis_result(
     try:
         user_id = current_user["user_id"]
 
-        job = database_service.get_job_by_id(db, job_id, user_id)
+        job = await database_service.get_job_with_results_async(db, job_id, user_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found.")
 
@@ -136,8 +196,8 @@ async def get_analysis_result(
         elif job.status != "completed":
             raise HTTPException(status_code=400, detail=f"Job status: {job.status}")
 
-        reports = database_service.get_user_reports(db, user_id)
-        job_report = next((r for r in reports if str(r.job_id) == job_id), None)
+        job_report = max(job.reports, key=lambda r: r.created_at, default=None)
+        job_audio = max(job.audio_files, key=lambda a: a.created_at, default=None)
 
         if not job_report:
             raise HTTPException(status_code=404, detail="Report not found.")
@@ -149,7 +209,7 @@ async def get_analysis_result(
             download_url = user_s3_service.get_presigned_url(job_report.s3_key)
             report_content = None
             try:
-                content = user_s3_service.get_file_content(job_report.s3_key)
+                content = await io_executor.run("s3", user_s3_service.get_file_content, job_report.s3_key)
                 if content and job_report.file_type == 'json':
                     report_content = json.loads(content)
                     logger.info(f"Loaded report from S3: {job_id}")
@@ -165,6 +225,7 @@ async def get_analysis_result(
                 "s3_key": job_report.s3_key,
                 "file_type": job_report.file_type,
                 "content": report_content,
+                "audio_s3_key": job_audio.s3_key if job_audio else None,
                 "message": "YouTube Reporter analysis completed."
             }
 
@@ -181,35 +242,47 @@ async def get_analysis_result(
 
 @router.get("/jobs")
 async def list_my_analyses(
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        job_type: str = "youtube_reporter",
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List of YouTube Reporter analysis jobs for the current logged-in user.
+    List of YouTube Reporter analysis jobs for the current logged-in user, newest first.
+
+    - **limit**: Page size (1-100)
+    - **cursor**: `next_cursor` from the previous page
+    - **status**: Optional status filter ('processing', 'completed', 'failed')
     """
     try:
         if not current_user:
-            return {"jobs": [], "total": 0}
+            return {"jobs": [], "total": 0, "next_cursor": None}
 
         user_id = current_user["user_id"]
 
-        all_jobs = database_service.get_user_jobs(db, user_id)
-        youtube_jobs = [job for job in all_jobs if job.job_type == "youtube_reporter"]
+        jobs, next_cursor = await database_service.list_user_jobs(
+            db, user_id, job_type=job_type, status=status, limit=limit, cursor=cursor
+        )
 
         return {
             "jobs": [
                 {
                     "id": str(job.id),
                     "status": job.status,
-                    "youtube_url": job.input_data.get("youtube_url", ""),
+                    "youtube_url": (job.input_data or {}).get("youtube_url", ""),
                     "created_at": job.created_at.isoformat(),
                     "completed_at": job.completed_at.isoformat() if job.completed_at else None
                 }
-                for job in youtube_jobs
+                for job in jobs
             ],
-            "total": len(youtube_jobs)
+            "total": len(jobs),
+            "next_cursor": next_cursor
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to retrieve job list: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve job list: {str(e)}")
@@ -233,6 +306,11 @@ async def delete_analysis_job(
         if not success:
             raise HTTPException(status_code=404, detail="Job not found.")
 
+        try:
+            state_manager.forget_job(user_id, job_id)
+        except Exception as e:
+            logger.warning(f"Failed to drop job from state manager: {e}")
+
         return {"message": f"Job {job_id} has been deleted."}
 
     except HTTPException:
@@ -0,0 +1,182 @@
+import abc
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, Any, Optional
+
+from core.cache import TTLCache
+from core.config import settings
+from s3.services.user_s3_service import user_s3_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CaptionStore(abc.ABC):
+    """Caption cache shared by all users, keyed by video ID and locale
+
+    Entries record whether a caption was found, so "Caption not found." results
+    are cached too (for CAPTION_NEGATIVE_TTL_SECONDS instead of the full TTL).
+    Subclasses only implement raw reads and writes.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def get(self, video_id: str, locale: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh entry ({"caption", "found", "stored_at"}) or None"""
+        try:
+            entry = self._read(self._key(video_id, locale))
+        except Exception as e:
+            logger.warning(f"Caption cache read failed (ignored): {e}")
+            return None
+
+        if not entry:
+            return None
+
+        max_age = self.ttl if entry.get("found") else self.negative_ttl
+        if time.time() - entry.get("stored_at", 0) > max_age:
+            return None
+        return entry
+
+    def put(self, video_id: str, locale: str, caption: Optional[str]):
+        """Store a caption, or a negative entry when caption is None"""
+        entry = {
+            "caption": caption,
+            "found": caption is not None,
+            "stored_at": time.time()
+        }
+        try:
+            self._write(self._key(video_id, locale), entry)
+        except Exception as e:
+            logger.warning(f"Caption cache write failed (ignored): {e}")
+
+    def _key(self, video_id: str, locale: str) -> str:
+        safe_video_id = re.sub(r'[^A-Za-z0-9_-]', '_', video_id)
+        safe_locale = re.sub(r'[^A-Za-z0-9_-]', '_', locale)
+        return f"{safe_locale}/{safe_video_id}"
+
+    @abc.abstractmethod
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _write(self, key: str, entry: Dict[str, Any]):
+        raise NotImplementedError
+
+
+class MemoryCaptionStore(CaptionStore):
+    """Per-process LRU backend"""
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int):
+        super().__init__(ttl, negative_ttl)
+        self.cache = TTLCache(max_entries=max_entries, ttl=max(ttl, negative_ttl))
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(key)
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        self.cache.set(key, entry)
+
+
+class DiskCaptionStore(CaptionStore):
+    """Local disk backend, one JSON file per entry under CAPTION_CACHE_DIR
+
+    Files older than the longest TTL are deleted by a sweep that runs on write,
+    at most once per negative TTL, so the directory does not grow without bound.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, directory: str):
+        super().__init__(ttl, negative_ttl)
+        self.directory = directory
+        self.sweep_interval = negative_ttl
+        self.last_sweep = 0.0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp file per write: threads of one process may write the same key concurrently
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        self._sweep_expired()
+
+    def _sweep_expired(self):
+        now = time.time()
+        if now - self.last_sweep < self.sweep_interval:
+            return
+        self.last_sweep = now
+
+        cutoff = now - max(self.ttl, self.negative_ttl)
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+
+class S3CaptionStore(CaptionStore):
+    """S3 backend under CAPTION_CACHE_PREFIX, shared by every pod
+
+    Stale objects are only skipped on read, never deleted here; the bucket needs a
+    lifecycle rule expiring CAPTION_CACHE_PREFIX objects after CAPTION_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, prefix: str):
+        super().__init__(ttl, negative_ttl)
+        self.s3_client = user_s3_service.s3_client
+        self.bucket_name = user_s3_service.bucket_name
+        self.prefix = prefix.rstrip("/")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=f"{self.prefix}/{key}.json")
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return json.loads(response["Body"].read().decode("utf-8"))
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{self.prefix}/{key}.json",
+            Body=json.dumps(entry, ensure_ascii=False),
+            ContentType="application/json"
+        )
+
+
+def create_caption_store() -> CaptionStore:
+    backend = settings.CAPTION_CACHE_BACKEND.lower()
+    ttl = settings.CAPTION_CACHE_TTL_SECONDS
+    negative_ttl = settings.CAPTION_NEGATIVE_TTL_SECONDS
+
+    if backend == "disk":
+        return DiskCaptionStore(ttl, negative_ttl, settings.CAPTION_CACHE_DIR)
+    if backend == "s3":
+        return S3CaptionStore(ttl, negative_ttl, settings.CAPTION_CACHE_PREFIX)
+    if backend != "memory":
+        logger.warning(f"Unknown CAPTION_CACHE_BACKEND '{backend}', using memory")
+    return MemoryCaptionStore(ttl, negative_ttl, settings.CAPTION_CACHE_MAX_ENTRIES)
+
+
+caption_store = create_caption_store()
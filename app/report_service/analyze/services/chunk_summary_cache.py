@@ -0,0 +1,80 @@
+import hashlib
+from typing import Optional
+
+from core.cache import TTLCache
+from core.config import settings
+from s3.services.user_s3_service import user_s3_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkSummaryCache:
+    """Content-addressed cache of partial (map/reduce) summaries
+
+    Keys hash the model, the prompt and the chunk text, so a re-run of the same
+    video, or another video sharing a stretch of transcript, reuses the summary.
+    An in-process LRU sits in front; the "s3" backend adds a tier shared by
+    every worker under SUMMARY_CHUNK_CACHE_PREFIX.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, s3_prefix: Optional[str] = None):
+        self.memory = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.s3_prefix = s3_prefix.rstrip("/") if s3_prefix else None
+        if self.s3_prefix:
+            self.s3_client = user_s3_service.s3_client
+            self.bucket_name = user_s3_service.bucket_name
+
+    def build_key(self, prompt_template: str, text: str) -> str:
+        """sha256 of the model ID, the rendered prompt template and the text"""
+        digest = hashlib.sha256()
+        for part in (settings.BEDROCK_MODEL_ID, prompt_template, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        summary = self.memory.get(key)
+        if summary is not None or not self.s3_prefix:
+            return summary
+
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=f"{self.s3_prefix}/{key}.txt")
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            logger.warning(f"Chunk summary cache read failed (ignored): {e}")
+            return None
+
+        summary = response["Body"].read().decode("utf-8")
+        self.memory.set(key, summary)
+        return summary
+
+    def put(self, key: str, summary: str):
+        self.memory.set(key, summary)
+        if not self.s3_prefix:
+            return
+
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=f"{self.s3_prefix}/{key}.txt",
+                Body=summary.encode("utf-8"),
+                ContentType="text/plain; charset=utf-8"
+            )
+        except Exception as e:
+            logger.warning(f"Chunk summary cache write failed (ignored): {e}")
+
+
+def create_chunk_summary_cache() -> ChunkSummaryCache:
+    backend = settings.SUMMARY_CHUNK_CACHE_BACKEND.lower()
+    if backend not in ("memory", "s3"):
+        logger.warning(f"Unknown SUMMARY_CHUNK_CACHE_BACKEND '{backend}', using memory")
+    return ChunkSummaryCache(
+        max_entries=settings.SUMMARY_CHUNK_CACHE_MAX_ENTRIES,
+        ttl=settings.SUMMARY_CHUNK_CACHE_TTL_SECONDS,
+        s3_prefix=settings.SUMMARY_CHUNK_CACHE_PREFIX if backend == "s3" else None
+    )
+
+
+chunk_summary_cache = create_chunk_summary_cache()
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+
+from core.config import settings
+from analyze.services.state_manager import ProgressSubscription
+import logging
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def job_event_stream(request: Request, snapshot: dict,
+                           subscription: Optional[ProgressSubscription]) -> AsyncIterator[str]:
+    """Yield the current job snapshot, then every published event until the job finishes
+
+    The subscription is drained without blocking on every tick, so an open stream
+    holds no thread while it waits; a comment line is sent as keepalive so proxies
+    do not close idle connections.
+    """
+    poll_interval = settings.PROGRESS_STREAM_POLL_SECONDS
+    keepalive_interval = settings.PROGRESS_STREAM_KEEPALIVE_SECONDS
+
+    try:
+        yield format_sse("snapshot", snapshot)
+        if subscription is None or snapshot.get("status") in TERMINAL_STATUSES:
+            return
+
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            event = subscription.get(timeout=0)
+            while event is not None:
+                event_type = event.get("type", "message")
+                yield format_sse(event_type, event)
+                last_sent = time.monotonic()
+                if event_type in TERMINAL_STATUSES:
+                    return
+                event = subscription.get(timeout=0)
+
+            if time.monotonic() - last_sent >= keepalive_interval:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(poll_interval)
+
+    finally:
+        if subscription is not None:
+            try:
+                subscription.close()
+            except Exception as e:
+                logger.warning(f"Failed to close progress subscription (ignored): {e}")
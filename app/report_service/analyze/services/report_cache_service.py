@@ -0,0 +1,169 @@
+import copy
+import hashlib
+import json
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Optional
+
+from core.config import settings
+from s3.services.user_s3_service import user_s3_service
+from s3.services.report_codec import encode_json, decode_body
+from analyze.services.youtube_metadata_service import youtube_metadata_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCacheService:
+    """Shared cache of finished reports keyed by video ID and pipeline version
+
+    Entries live in S3 under REPORT_CACHE_PREFIX as `{cache_key}.json`, with the
+    caption kept next to it as `{cache_key}_caption.txt` (narration is reused
+    through AudioService's TTS cache). Entries older than REPORT_CACHE_TTL_SECONDS are
+    ignored, and the oldest entries are evicted once there are more than
+    REPORT_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self):
+        self.s3_client = user_s3_service.s3_client
+        self.bucket_name = user_s3_service.bucket_name
+        self.prefix = settings.REPORT_CACHE_PREFIX.rstrip("/")
+        self.ttl = timedelta(seconds=settings.REPORT_CACHE_TTL_SECONDS)
+        self.max_entries = settings.REPORT_CACHE_MAX_ENTRIES
+        self.enabled = settings.REPORT_CACHE_ENABLED
+
+    def build_key(self, youtube_url: str, pipeline_version: str) -> Optional[str]:
+        """Return the cache key for a URL, or None if no video ID can be extracted"""
+        video_id = youtube_metadata_service.extract_video_id(youtube_url)
+        if not video_id:
+            return None
+        digest = hashlib.sha256(f"{video_id}:{pipeline_version}".encode("utf-8")).hexdigest()[:32]
+        return f"{video_id}_{digest}"
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry, or None on a miss or an expired entry"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self._entry_key(cache_key))
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            logger.warning(f"Report cache lookup failed (ignored): {e}")
+            return None
+
+        if self._is_expired(response.get("LastModified")):
+            logger.info(f"Report cache entry expired: {cache_key}")
+            self._delete_entry(cache_key)
+            return None
+
+        try:
+            return json.loads(decode_body(response["Body"].read(), response.get("ContentEncoding")))
+        except Exception as e:
+            logger.warning(f"Corrupt report cache entry {cache_key} (ignored): {e}")
+            return None
+
+    def put(self, cache_key: str, result: Dict[str, Any], caption_s3_key: Optional[str] = None):
+        """Store a successful workflow result together with a copy of its caption"""
+        try:
+            cached_caption_key = None
+            if caption_s3_key:
+                try:
+                    cached_caption_key = self._caption_key(cache_key)
+                    self._copy(caption_s3_key, cached_caption_key, "text/plain")
+                except Exception as e:
+                    logger.warning(f"Caption not cached for {cache_key}: {e}")
+                    cached_caption_key = None
+
+            entry = {
+                "cache_key": cache_key,
+                "result": result,
+                "caption_s3_key": cached_caption_key,
+                "created_at": datetime.utcnow().isoformat()
+            }
+            body, headers = encode_json(entry)
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=self._entry_key(cache_key),
+                Body=body,
+                **headers
+            )
+            logger.info(f"Report cached: {cache_key}")
+            self._evict()
+
+        except Exception as e:
+            logger.warning(f"Failed to store report in cache (ignored): {e}")
+
+    def copy_cached_caption(self, cached_caption_key: str, user_id: str, job_id: str) -> str:
+        """Copy the cached caption to the per-job key the chatbot KB sync expects"""
+        caption_s3_key = f"captions/{user_id}/{job_id}_caption.txt"
+        self._copy(cached_caption_key, caption_s3_key, "text/plain",
+                   {"created_at": datetime.utcnow().isoformat()})
+        return caption_s3_key
+
+    def _copy(self, source_key: str, target_key: str, content_type: str, metadata: Optional[Dict[str, str]] = None):
+        self.s3_client.copy_object(
+            Bucket=self.bucket_name,
+            Key=target_key,
+            CopySource={"Bucket": self.bucket_name, "Key": source_key},
+            ContentType=content_type,
+            Metadata=metadata or {},
+            MetadataDirective="REPLACE"
+        )
+
+    def result_for_job(self, entry: Dict[str, Any], job_id: str, user_id: str) -> Dict[str, Any]:
+        """Return a copy of the cached result re-labelled for the requesting job"""
+        result = copy.deepcopy(entry.get("result", {}))
+        process_info = result.setdefault("process_info", {})
+        process_info["job_id"] = job_id
+        process_info["user_id"] = user_id
+        process_info["cache_key"] = entry.get("cache_key")
+        process_info["cached_at"] = entry.get("created_at")
+        return result
+
+    def _evict(self):
+        """Drop expired entries and the oldest ones beyond max_entries"""
+        entries = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{self.prefix}/"):
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(".json"):
+                    entries.append(obj)
+
+        entries.sort(key=lambda obj: obj["LastModified"])
+        overflow = max(0, len(entries) - self.max_entries)
+
+        for i, obj in enumerate(entries):
+            if i >= overflow and not self._is_expired(obj["LastModified"]):
+                continue
+            cache_key = obj["Key"][len(self.prefix) + 1:-len(".json")]
+            self._delete_entry(cache_key)
+            logger.info(f"Evicted report cache entry: {cache_key}")
+
+    def _delete_entry(self, cache_key: str):
+        try:
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [
+                    {"Key": self._entry_key(cache_key)},
+                    # Entries written before the TTS cache also kept a copy of the audio
+                    {"Key": self._audio_key(cache_key)},
+                    {"Key": self._caption_key(cache_key)}
+                ]}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to delete report cache entry {cache_key}: {e}")
+
+    def _is_expired(self, last_modified: Optional[datetime]) -> bool:
+        if not last_modified:
+            return True
+        return datetime.now(timezone.utc) - last_modified > self.ttl
+
+    def _entry_key(self, cache_key: str) -> str:
+        return f"{self.prefix}/{cache_key}.json"
+
+    def _audio_key(self, cache_key: str) -> str:
+        return f"{self.prefix}/{cache_key}.mp3"
+
+    def _caption_key(self, cache_key: str) -> str:
+        return f"{self.prefix}/{cache_key}_caption.txt"
+
+
+report_cache_service = ReportCacheService()
@@ -1,15 +1,262 @@
+import json
 import logging
+import queue
+import threading
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from core.config import settings
+
 logger = logging.getLogger(__name__)
 
+
+class ProgressSubscription:
+    """Blocking handle on a job's event channel"""
+
+    def get(self, timeout: float) -> Optional[dict]:
+        """Return the next event, or None if nothing arrived within the timeout"""
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
 class SimpleStateManager:
-    
+    """Job progress store
+
+    Each job has a progress record (progress, message, status, owner and input)
+    that expires after PROGRESS_TTL_SECONDS, each user has a set of active job
+    IDs, and every progress change is published to the job's event channel.
+    This base implementation keeps everything in process memory, which is
+    enough for tests and single-pod setups.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._active_jobs: Dict[str, set] = {}
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+
+    def add_user_active_job(self, user_id: str, job_id: str, input_data: Optional[dict] = None):
+        """Register a job; fields a worker has already written (progress, status) are kept"""
+        record = self._initial_record(user_id, input_data)
+        with self._lock:
+            self._sweep_expired()
+            job = self._jobs.setdefault(job_id, {})
+            for field, value in record.items():
+                job.setdefault(field, value)
+            self._expires_at[job_id] = time.monotonic() + self.ttl
+            self._active_jobs.setdefault(user_id, set()).add(job_id)
+
     def update_progress(self, job_id: str, progress: int, message: str = ""):
         logger.info(f"Job {job_id}: {progress}% - {message}")
-    
+        update = {"progress": progress, "message": message, "updated_at": datetime.utcnow().isoformat()}
+        with self._lock:
+            self._sweep_expired()
+            self._jobs.setdefault(job_id, {}).update(update)
+            self._expires_at[job_id] = time.monotonic() + self.ttl
+        self.publish(job_id, {"type": "progress", **update})
+
+    def mark_job_status(self, job_id: str, status: str):
+        """Record the final job status once the result has been persisted"""
+        update = {"status": status, "completed_at": datetime.utcnow().isoformat()}
+        with self._lock:
+            self._jobs.setdefault(job_id, {}).update(update)
+            self._expires_at[job_id] = time.monotonic() + self.ttl
+        self.publish(job_id, {"type": status, **update})
+
     def get_progress(self, job_id: str) -> Optional[dict]:
-        return {"progress": 0, "message": "In Process..."}
+        with self._lock:
+            if self._expires_at.get(job_id, 0) <= time.monotonic():
+                self._jobs.pop(job_id, None)
+                self._expires_at.pop(job_id, None)
+                return None
+            return dict(self._jobs[job_id])
+
+    def remove_user_active_job(self, user_id: str, job_id: str):
+        with self._lock:
+            self._active_jobs.get(user_id, set()).discard(job_id)
+
+    def get_user_active_jobs(self, user_id: str) -> List[str]:
+        with self._lock:
+            return list(self._active_jobs.get(user_id, set()))
+
+    def forget_job(self, user_id: str, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+            self._active_jobs.get(user_id, set()).discard(job_id)
+
+    def publish(self, job_id: str, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, []))
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def subscribe(self, job_id: str) -> ProgressSubscription:
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(events)
+        return _InMemorySubscription(self, job_id, events)
+
+    def _unsubscribe(self, job_id: str, events: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, [])
+            if events in subscribers:
+                subscribers.remove(events)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def _sweep_expired(self):
+        """Drop expired records and their active-job entries; call with the lock held"""
+        now = time.monotonic()
+        expired = [job_id for job_id, expires_at in self._expires_at.items() if expires_at <= now]
+        if not expired:
+            return
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+        expired = set(expired)
+        for user_id in list(self._active_jobs):
+            self._active_jobs[user_id] -= expired
+            if not self._active_jobs[user_id]:
+                del self._active_jobs[user_id]
+
+    def _initial_record(self, user_id: str, input_data: Optional[dict]) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "status": "processing",
+            "progress": 0,
+            "message": "Queued for analysis...",
+            "created_at": datetime.utcnow().isoformat(),
+            "input_data": input_data or {}
+        }
+
+
+class _InMemorySubscription(ProgressSubscription):
+    def __init__(self, manager: SimpleStateManager, job_id: str, events: queue.Queue):
+        self.manager = manager
+        self.job_id = job_id
+        self.events = events
+
+    def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.manager._unsubscribe(self.job_id, self.events)
+
+
+class RedisStateManager(SimpleStateManager):
+    """Redis-backed store shared by every API replica and worker
+
+    Keys: `job:{job_id}` hash with a TTL, `user:{user_id}:active_jobs` set, and
+    `job:{job_id}:events` pub/sub channel. A status poll is a single HGETALL.
+    """
+
+    def __init__(self, redis_url: str, ttl: int):
+        import redis
+
+        super().__init__(ttl)
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def add_user_active_job(self, user_id: str, job_id: str, input_data: Optional[dict] = None):
+        record = self._initial_record(user_id, input_data)
+        record["input_data"] = json.dumps(record["input_data"], ensure_ascii=False)
+        pipe = self.client.pipeline(transaction=False)
+        for field, value in record.items():
+            pipe.hsetnx(self._job_key(job_id), field, value)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.sadd(self._user_key(user_id), job_id)
+        pipe.expire(self._user_key(user_id), self.ttl)
+        pipe.execute()
+
+    def update_progress(self, job_id: str, progress: int, message: str = ""):
+        logger.info(f"Job {job_id}: {progress}% - {message}")
+        update = {"progress": progress, "message": message, "updated_at": datetime.utcnow().isoformat()}
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(self._job_key(job_id), mapping=update)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.publish(self._channel(job_id), json.dumps({"type": "progress", **update}, ensure_ascii=False))
+        pipe.execute()
+
+    def mark_job_status(self, job_id: str, status: str):
+        update = {"status": status, "completed_at": datetime.utcnow().isoformat()}
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(self._job_key(job_id), mapping=update)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.publish(self._channel(job_id), json.dumps({"type": status, **update}, ensure_ascii=False))
+        pipe.execute()
+
+    def get_progress(self, job_id: str) -> Optional[dict]:
+        record = self.client.hgetall(self._job_key(job_id))
+        if not record:
+            return None
+        record["progress"] = int(record.get("progress", 0))
+        if "input_data" in record:
+            try:
+                record["input_data"] = json.loads(record["input_data"])
+            except ValueError:
+                record["input_data"] = {}
+        return record
+
+    def remove_user_active_job(self, user_id: str, job_id: str):
+        self.client.srem(self._user_key(user_id), job_id)
+
+    def get_user_active_jobs(self, user_id: str) -> List[str]:
+        return list(self.client.smembers(self._user_key(user_id)))
+
+    def forget_job(self, user_id: str, job_id: str):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(self._job_key(job_id))
+        pipe.srem(self._user_key(user_id), job_id)
+        pipe.execute()
+
+    def publish(self, job_id: str, event: dict):
+        self.client.publish(self._channel(job_id), json.dumps(event, ensure_ascii=False))
+
+    def subscribe(self, job_id: str) -> ProgressSubscription:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(job_id))
+        return _RedisSubscription(pubsub)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"user:{user_id}:active_jobs"
+
+    def _channel(self, job_id: str) -> str:
+        return f"job:{job_id}:events"
+
+
+class _RedisSubscription(ProgressSubscription):
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def get(self, timeout: float) -> Optional[dict]:
+        message = self.pubsub.get_message(timeout=timeout)
+        if not message or message.get("type") != "message":
+            return None
+        return json.loads(message["data"])
+
+    def close(self):
+        self.pubsub.close()
+
+
+def create_state_manager() -> SimpleStateManager:
+    if settings.REDIS_URL:
+        return RedisStateManager(settings.REDIS_URL, settings.PROGRESS_TTL_SECONDS)
+    # Postgres-queue workers run in other processes; an in-process store would never
+    # see their progress, so the status fast path and SSE streams would hang on "processing"
+    if settings.REPORT_QUEUE_BACKEND.lower() == "postgres":
+        raise RuntimeError("REPORT_QUEUE_BACKEND=postgres requires REDIS_URL for the shared progress store")
+    return SimpleStateManager(settings.PROGRESS_TTL_SECONDS)
+
 
-state_manager = SimpleStateManager()
\ No newline at end of file
+state_manager = create_state_manager()
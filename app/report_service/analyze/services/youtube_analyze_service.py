@@ -1,5 +1,4 @@
 import uuid
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
@@ -8,9 +7,14 @@ from analyze.workflow.youtube_workflow import YouTubeReporterWorkflow
 from database.services.database_service import database_service
 from s3.services.user_s3_service import user_s3_service
 from s3.services.s3_service import s3_service
+from s3.services.report_codec import encode_json
 from audio.services.audio_service import audio_service
 from analyze.services.state_manager import state_manager
 from analyze.services.youtube_metadata_service import youtube_metadata_service
+from analyze.services.report_cache_service import report_cache_service
+from worker.services.job_queue import job_queue
+from core.config import settings
+from core.io_executor import io_executor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,16 +27,43 @@ class YouTubeReporterService:
         self.workflow = YouTubeReporterWorkflow()
         logger.info("YouTube Reporter service initialized")
 
-    async def create_analysis_job(self, user_id: str, youtube_url: str, db: Session, include_audio: bool = True) -> str:
-        """Create a new YouTube analysis job"""
+    async def create_analysis_job(self, user_id: str, youtube_url: str, include_audio: bool = True) -> str:
+        """Create a new YouTube analysis job and queue it for a report worker
+
+        The progress record is registered first, since a worker may pick the job up
+        as soon as it is committed. The capacity check, job row and queue entry are
+        then written in one transaction on the db pool, off the event loop. Raises
+        QueueFullError when admission control rejects the job.
+        """
         try:
-            job = database_service.create_analysis_job(
-                db=db,
-                user_id=user_id,
-                job_type="youtube_reporter",
-                input_data={"youtube_url": youtube_url, "include_audio": include_audio}
-            )
-            job_id = str(job.id)
+            job_id = str(uuid.uuid4())
+            payload = {"youtube_url": youtube_url, "include_audio": include_audio}
+
+            try:
+                state_manager.add_user_active_job(user_id, job_id, payload)
+            except Exception as e:
+                logger.warning(f"Failed to register job in state manager: {e}")
+
+            def create_job(db: Session) -> str:
+                job = database_service.create_analysis_job(
+                    db=db,
+                    user_id=user_id,
+                    job_type="youtube_reporter",
+                    input_data=payload,
+                    commit=False,
+                    job_id=job_id
+                )
+                return str(job.id)
+
+            try:
+                await io_executor.run("db", job_queue.submit, user_id, payload, create_job)
+            except Exception:
+                try:
+                    state_manager.forget_job(user_id, job_id)
+                except Exception as e:
+                    logger.warning(f"Failed to drop rejected job from state manager: {e}")
+                raise
+
             logger.info(f"YouTube Reporter job created: {job_id}")
             return job_id
 
@@ -46,11 +77,36 @@ class YouTubeReporterService:
         try:
             logger.info(f"Starting YouTube analysis: {job_id}")
 
-            result = self.workflow.process(
-                youtube_url=youtube_url,
-                job_id=job_id,
-                user_id=user_id
-            )
+            cache_key = None
+            cached_entry = None
+            if report_cache_service.enabled:
+                cache_key = report_cache_service.build_key(youtube_url, self.workflow.pipeline_version)
+                if cache_key:
+                    cached_entry = await io_executor.run("s3", report_cache_service.get, cache_key)
+
+            if cached_entry:
+                logger.info(f"Report cache hit for job {job_id}: {cache_key}")
+                result = report_cache_service.result_for_job(cached_entry, job_id, user_id)
+                if cached_entry.get("caption_s3_key"):
+                    try:
+                        await io_executor.run(
+                            "s3", report_cache_service.copy_cached_caption,
+                            cached_entry["caption_s3_key"], user_id, job_id
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to copy cached caption: {e}")
+                try:
+                    state_manager.update_progress(job_id, 100, "Analysis complete!")
+                except Exception as e:
+                    logger.warning(f"Failed to update progress: {e}")
+            else:
+                result = await io_executor.run(
+                    "bedrock",
+                    self.workflow.process,
+                    youtube_url=youtube_url,
+                    job_id=job_id,
+                    user_id=user_id
+                )
 
             s3_info = await self._save_report_to_s3(
                 user_id=user_id,
@@ -59,6 +115,7 @@ class YouTubeReporterService:
                 youtube_url=youtube_url
             )
 
+            # Identical summaries hit AudioService's TTS cache, so cached reports reuse their narration
             audio_info = None
             if include_audio and result.get("success"):
                 try:
@@ -85,7 +142,8 @@ class YouTubeReporterService:
                     user_id=user_id,
                     title=result.get("title", "YouTube Analysis Report"),
                     s3_key=s3_info["s3_key"],
-                    file_type="json"
+                    file_type="json",
+                    metadata=s3_info.get("metadata")
                 )
 
             if audio_info and audio_info.get("success"):
@@ -97,7 +155,17 @@ class YouTubeReporterService:
                     duration=audio_info.get("duration_estimate", 0)
                 )
 
+            if cache_key and not cached_entry and self._is_cacheable(result):
+                await io_executor.run(
+                    "s3",
+                    report_cache_service.put,
+                    cache_key,
+                    result,
+                    caption_s3_key=f"captions/{user_id}/{job_id}_caption.txt"
+                )
+
             try:
+                state_manager.mark_job_status(job_id, "completed" if result.get("success") else "failed")
                 state_manager.remove_user_active_job(user_id, job_id)
             except Exception as e:
                 logger.warning(f"Failed to remove job from state manager: {e}")
@@ -119,19 +187,26 @@ class YouTubeReporterService:
             database_service.update_job_status(db=db, job_id=job_id, status="failed")
 
             try:
+                state_manager.mark_job_status(job_id, "failed")
                 state_manager.remove_user_active_job(user_id, job_id)
             except Exception as redis_error:
                 logger.warning(f"State cleanup failed: {redis_error}")
 
             raise
 
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        """Only share reports built from a real caption and a successful summary"""
+        process_info = result.get("process_info", {})
+        return bool(result.get("success") and process_info.get("caption_ok") and process_info.get("summary_ok"))
+
     async def _save_report_to_s3(self, user_id: str, job_id: str, result: Dict[str, Any],
                                  youtube_url: str) -> Dict[str, Any]:
         """Save analysis report to S3"""
         try:
             logger.info(f"Uploading report to S3 for job {job_id}")
 
-            youtube_metadata = youtube_metadata_service.get_youtube_metadata(youtube_url)
+            youtube_metadata = await io_executor.run("http", youtube_metadata_service.get_youtube_metadata, youtube_url)
 
             report_data = {
                 "report": result,
@@ -151,18 +226,23 @@ class YouTubeReporterService:
                 }
             }
 
-            s3_key = user_s3_service.upload_user_report(
+            body, headers = encode_json(report_data)
+            s3_key = await io_executor.run(
+                "s3",
+                user_s3_service.upload_user_report,
                 user_id=user_id,
                 job_id=job_id,
-                content=json.dumps(report_data, ensure_ascii=False, indent=2),
-                file_type="json"
+                content=body,
+                file_type="json",
+                content_encoding=headers.get("ContentEncoding")
             )
 
             logger.info(f"S3 upload completed: {s3_key}")
             return {
                 "success": True,
                 "s3_key": s3_key,
-                "bucket": user_s3_service.bucket_name
+                "bucket": user_s3_service.bucket_name,
+                "metadata": report_data["metadata"]
             }
 
         except Exception as e:
@@ -183,7 +263,7 @@ class YouTubeReporterService:
             audio_result = await audio_service.generate_audio(
                 text=summary,
                 job_id=job_id,
-                voice_id="Seoyeon"
+                voice_id=settings.POLLY_VOICE_ID
             )
 
             if audio_result.get("success"):
@@ -198,7 +278,7 @@ class YouTubeReporterService:
             return {"success": False, "error": str(e)}
 
     def get_job_progress(self, job_id: str) -> Dict[str, Any]:
-        """Get progress of analysis job"""
+        """Get progress of analysis job (includes owner and status when the job is still tracked)"""
         try:
             progress = state_manager.get_progress(job_id)
             return progress or {"progress": 0, "message": "No progress available"}
@@ -1,5 +1,8 @@
-from typing import TypedDict, Dict, Any, List
+import hashlib
+import json
+from typing import TypedDict, Dict, Any, List, Annotated
 from langgraph.graph import StateGraph
+from core.config import settings
 from analyze.agents.caption_extractor import CaptionAgent
 from analyze.agents.content_summarizer import SummaryAgent
 from analyze.agents.visualization_generator import SmartVisualAgent
@@ -10,14 +13,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _keep_latest(current, update):
+    """Reducer for keys filled in by parallel branches: the latest non-None write wins"""
+    return current if update is None else update
+
+
 class GraphState(TypedDict):
     """Workflow state schema for YouTube Reporter"""
     job_id: str
     user_id: str
     youtube_url: str
     caption: str
+    caption_ok: bool
     summary: str
-    visual_sections: List[Dict[str, Any]]
+    summary_ok: bool
+    structured_sections: Annotated[List[Dict[str, Any]], _keep_latest]
+    visual_sections: Annotated[List[Dict[str, Any]], _keep_latest]
     report_result: Dict[str, Any]
     final_output: Dict[str, Any]
 
@@ -32,8 +43,25 @@ class YouTubeReporterWorkflow:
         self.visual_agent = SmartVisualAgent()
         self.report_agent = ReportAgent()
         self.graph = self._build_graph()
+        self.pipeline_version = self._compute_pipeline_version()
         logger.info("YouTube Reporter workflow initialized successfully")
 
+    def _compute_pipeline_version(self) -> str:
+        """Fingerprint of the settings and prompts that shape a report, used to key cached results"""
+        fingerprint = json.dumps({
+            "version": settings.REPORT_PIPELINE_VERSION,
+            "model_id": settings.BEDROCK_MODEL_ID,
+            "temperature": settings.BEDROCK_TEMPERATURE,
+            "max_tokens": settings.BEDROCK_MAX_TOKENS,
+            "voice_id": settings.POLLY_VOICE_ID,
+            "summary_prompt": self.summary_agent.prompt.pretty_repr(),
+            "chunk_prompt": self.summary_agent.chunk_prompt.pretty_repr(),
+            "reduce_prompt": self.summary_agent.reduce_prompt.pretty_repr(),
+            "single_pass_tokens": settings.SUMMARY_SINGLE_PASS_TOKENS,
+            "chunk_tokens": settings.SUMMARY_CHUNK_TOKENS
+        }, sort_keys=True)
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
     def _build_graph(self):
         """Build the LangGraph workflow"""
         builder = StateGraph(state_schema=GraphState)
@@ -41,15 +69,18 @@ class YouTubeReporterWorkflow:
         # Add nodes
         builder.add_node("caption_node", self.caption_agent)
         builder.add_node("summary_node", self.summary_agent)
+        builder.add_node("structure_node", self.report_agent.structure)
         builder.add_node("visual_node", self.visual_agent)
         builder.add_node("report_node", self.report_agent)
         builder.add_node("finalize_node", self._finalize_result)
 
-        # Define flow
+        # Define flow: structuring and visualization only need the summary,
+        # so they run as parallel branches and join before the report merge
         builder.set_entry_point("caption_node")
         builder.add_edge("caption_node", "summary_node")
+        builder.add_edge("summary_node", "structure_node")
         builder.add_edge("summary_node", "visual_node")
-        builder.add_edge("visual_node", "report_node")
+        builder.add_edge(["structure_node", "visual_node"], "report_node")
         builder.add_edge("report_node", "finalize_node")
         builder.add_edge("finalize_node", "__end__")
 
@@ -83,6 +114,8 @@ class YouTubeReporterWorkflow:
                 "youtube_url": state.get("youtube_url", ""),
                 "caption_length": len(state.get("caption", "")),
                 "summary_length": len(state.get("summary", "")),
+                "caption_ok": bool(state.get("caption_ok")),
+                "summary_ok": bool(state.get("summary_ok")),
                 "user_id": user_id,
                 "job_id": job_id,
                 "generated_at": report_result.get("metadata", {}).get("generated_at", "")
@@ -128,6 +161,25 @@ class YouTubeReporterWorkflow:
 
         return {**state, "final_output": final_output}
 
+    def _publish_node_update(self, job_id: str, node: str, update: dict):
+        """Push a node transition, plus any report sections it produced, to the job's event channel"""
+        events = [{"type": "node", "node": node, "status": "completed"}]
+
+        if node == "summary_node" and update.get("summary"):
+            events.append({"type": "section", "section": "summary", "content": update["summary"]})
+        elif node == "structure_node":
+            for i, section in enumerate(update.get("structured_sections") or []):
+                events.append({"type": "section", "section": "text", "index": i, "data": section})
+        elif node == "visual_node":
+            for i, section in enumerate(update.get("visual_sections") or []):
+                events.append({"type": "section", "section": "visualization", "index": i, "data": section})
+
+        try:
+            for event in events:
+                state_manager.publish(job_id, event)
+        except Exception as e:
+            logger.warning(f"Failed to publish {node} events (ignored): {e}")
+
     def process(self, youtube_url: str, job_id: str = None, user_id: str = None) -> dict:
         """Start processing from YouTube URL and build final report"""
         logger.info(f"\n{'=' * 60}")
@@ -141,7 +193,9 @@ class YouTubeReporterWorkflow:
             "user_id": user_id,
             "youtube_url": youtube_url,
             "caption": "",
+            "caption_ok": False,
             "summary": "",
+            "summary_ok": False,
             "visual_sections": [],
             "report_result": {},
             "final_output": {}
@@ -155,7 +209,13 @@ class YouTubeReporterWorkflow:
                     logger.warning(f"Failed to update initial progress: {e}")
 
             logger.info("Step 1: Extracting transcript...")
-            result = self.graph.invoke(initial_state)
+            result = {}
+            for mode, chunk in self.graph.stream(initial_state, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    result = chunk
+                elif job_id:
+                    for node, update in chunk.items():
+                        self._publish_node_update(job_id, node, update or {})
 
             final_output = result.get("final_output", {})
 
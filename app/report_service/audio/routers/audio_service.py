@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query
 from audio.models.audio import AudioRequest, AudioResponse
 from audio.services.audio_service import audio_service
+from core.config import settings
+from database.core.database import get_async_sessionmaker
 from datetime import datetime
 
 router = APIRouter(prefix="/audio", tags=["audio"])
@@ -28,12 +31,27 @@ async def generate_audio(request: AudioRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Audio generation failed: {str(e)}")
 
+@router.get("/cache/stats")
+async def get_tts_cache_stats():
+    """TTS cache hit/miss counters of this process"""
+    return audio_service.cache_stats()
+
 @router.get("/stream/{audio_id}")
-async def stream_audio(audio_id: str):
-    """Stream audio file from S3"""
+async def stream_audio(
+    audio_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    redirect: Optional[bool] = Query(None, description="Redirect to a presigned S3 URL (default: AUDIO_STREAM_REDIRECT)")
+):
+    """Stream audio file from S3 (supports Range requests)"""
     try:
-        audio_s3_key = await audio_service.find_audio_file(audio_id)
-        return await audio_service.stream_audio(audio_s3_key)
+        # Short-lived session: a request-scoped one would hold a pooled connection for the whole transfer
+        async with get_async_sessionmaker()() as db:
+            audio_s3_key = await audio_service.find_audio_file(audio_id, db)
+        return await audio_service.stream_audio(
+            audio_s3_key,
+            range_header=range_header,
+            redirect=settings.AUDIO_STREAM_REDIRECT if redirect is None else redirect
+        )
 
     except HTTPException:
         raise
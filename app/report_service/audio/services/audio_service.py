@@ -1,109 +1,316 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, RedirectResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
+from core.io_executor import io_executor
 from s3.services.s3_service import s3_service
+from database.services.database_service import database_service
+
+logger = logging.getLogger(__name__)
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。…])\s+|\n+')
+# S3 multipart uploads require every part except the last to be at least 5 MB
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
 
 class AudioService:
     def __init__(self):
-        self.polly_client = boto3.client('polly', region_name=settings.AWS_REGION)
+        self.polly_client = boto3.client(
+            'polly',
+            region_name=settings.AWS_REGION,
+            config=Config(max_pool_connections=settings.POLLY_POOL_SIZE)
+        )
         self.voice_id = settings.POLLY_VOICE_ID
+        self.chunk_chars = settings.POLLY_CHUNK_CHARS
+        self.max_concurrency = max(1, settings.POLLY_MAX_CONCURRENCY)
+        self.part_size = max(MIN_MULTIPART_PART_SIZE, settings.AUDIO_MULTIPART_PART_SIZE)
+        self.cache_enabled = settings.TTS_CACHE_ENABLED
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._stats_lock = threading.Lock()
 
     async def generate_audio(self, text: str, job_id: str, voice_id: Optional[str] = None) -> Dict[str, Any]:
-        """Generate audio using Polly from input text"""
+        """Generate audio using Polly from input text
+
+        With TTS_CACHE_ENABLED the MP3 is stored under a content-addressed key,
+        `audio/tts_{sha256(engine, voice, text)}.mp3`, and identical requests
+        return the existing object without calling Polly.
+        """
         try:
             voice_id = voice_id or self.voice_id
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            metadata = {
+                'voice-id': voice_id,
+                'engine': self._engine(voice_id),
+                'created-at': timestamp,
+                'text-length': str(len(text))
+            }
 
-            # Polly limit: max 3000 characters
-            if len(text) > 3000:
-                chunks = [text[i:i+2800] for i in range(0, len(text), 2800)]
-                audio_parts = []
-
-                for i, chunk in enumerate(chunks):
-                    response = self.polly_client.synthesize_speech(
-                        Text=chunk,
-                        OutputFormat='mp3',
-                        VoiceId=voice_id,
-                        Engine='neural' if voice_id in ['Seoyeon'] else 'standard'
-                    )
-                    audio_parts.append(response['AudioStream'].read())
-
-                audio_data = b''.join(audio_parts)
+            size = None
+            cache_hit = False
+            if self.cache_enabled:
+                audio_s3_key = self._cache_key(text, voice_id)
+                size = await self._cached_size(audio_s3_key)
+                cache_hit = size is not None
+                self._record_cache_result(cache_hit)
             else:
-                response = self.polly_client.synthesize_speech(
-                    Text=text,
-                    OutputFormat='mp3',
-                    VoiceId=voice_id,
-                    Engine='neural' if voice_id in ['Seoyeon'] else 'standard'
-                )
-                audio_data = response['AudioStream'].read()
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_s3_key = f"audio/{timestamp}_{job_id}.mp3"
+                audio_s3_key = f"audio/{timestamp}_{job_id}.mp3"
+                metadata['job-id'] = job_id
 
-            s3_service.s3_client.put_object(
-                Bucket=s3_service.bucket_name,
-                Key=audio_s3_key,
-                Body=audio_data,
-                ContentType='audio/mpeg',
-                Metadata={
-                    'job-id': job_id,
-                    'voice-id': voice_id,
-                    'created-at': timestamp,
-                    'text-length': str(len(text))
-                }
-            )
+            if size is None:
+                size = await self._synthesize_to_s3(self._split_text(text), voice_id, audio_s3_key, metadata)
 
             return {
                 "success": True,
+                "cache_hit": cache_hit,
                 "audio_s3_key": audio_s3_key,
                 "bucket": s3_service.bucket_name,
                 "voice_id": voice_id,
                 "audio_url": f"s3://{s3_service.bucket_name}/{audio_s3_key}",
-                "size": len(audio_data),
+                "size": size,
                 "duration_estimate": len(text) / 200  # approximate duration in seconds
             }
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Polly audio generation failed: {str(e)}")
 
-    async def stream_audio(self, audio_s3_key: str) -> StreamingResponse:
-        """Stream audio file from S3"""
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            total = self.cache_hits + self.cache_misses
+            return {
+                "enabled": self.cache_enabled,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": self.cache_hits / total if total else 0.0
+            }
+
+    def _record_cache_result(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _cache_key(self, text: str, voice_id: str) -> str:
+        # Flat under audio/ so /audio/stream/{audio_id} finds it like any other file
+        digest = hashlib.sha256(f"{self._engine(voice_id)}\0{voice_id}\0{text}".encode("utf-8")).hexdigest()
+        return f"audio/tts_{digest}.mp3"
+
+    async def _cached_size(self, audio_s3_key: str) -> Optional[int]:
+        """Size of an already synthesized object, or None on a miss"""
         try:
-            response = s3_service.s3_client.get_object(
-                Bucket=s3_service.bucket_name,
-                Key=audio_s3_key
+            response = await io_executor.run(
+                "s3", s3_service.s3_client.head_object, Bucket=s3_service.bucket_name, Key=audio_s3_key
             )
-            audio_stream = response['Body']
+            return response.get('ContentLength', 0)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+                logger.warning(f"TTS cache lookup failed for {audio_s3_key} (ignored): {e}")
+            return None
+        except BotoCoreError as e:
+            logger.warning(f"TTS cache lookup failed for {audio_s3_key} (ignored): {e}")
+            return None
+
+    def _engine(self, voice_id: str) -> str:
+        return 'neural' if voice_id in ['Seoyeon'] else 'standard'
+
+    def _split_text(self, text: str) -> List[str]:
+        """Split text into chunks under Polly's limit, breaking only between sentences where possible"""
+        chunks = []
+        current = ""
+        for sentence in SENTENCE_BOUNDARY.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            while len(sentence) > self.chunk_chars:
+                # Run-on sentence: cut at the last space before the limit, or hard-cut if there is none
+                cut = sentence.rfind(' ', 0, self.chunk_chars)
+                cut = cut if cut > 0 else self.chunk_chars
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if current and len(current) + 1 + len(sentence) > self.chunk_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+        return chunks or [text]
+
+    async def _synthesize_to_s3(self, chunks: List[str], voice_id: str, audio_s3_key: str,
+                                metadata: Dict[str, str]) -> int:
+        """Synthesize chunks concurrently and upload the MP3 in order; returns its size in bytes
+
+        At most POLLY_MAX_CONCURRENCY chunks are in flight. Audio is appended in chunk
+        order and flushed as multipart-upload parts of AUDIO_MULTIPART_PART_SIZE, so
+        uploading overlaps with synthesis; audio that fits in one part is a single put_object.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def synthesize(chunk: str) -> bytes:
+            async with semaphore:
+                return await io_executor.run("polly", self._synthesize, chunk, voice_id)
 
-            def generate():
+        tasks = [asyncio.ensure_future(synthesize(chunk)) for chunk in chunks]
+        s3_client = s3_service.s3_client
+        bucket = s3_service.bucket_name
+        upload_id = None
+        parts = []
+        buffer = bytearray()
+        size = 0
+
+        try:
+            for task in tasks:
+                buffer += await task
+                if len(buffer) < self.part_size:
+                    continue
+                if upload_id is None:
+                    upload = await io_executor.run(
+                        "s3", s3_client.create_multipart_upload,
+                        Bucket=bucket, Key=audio_s3_key, ContentType='audio/mpeg', Metadata=metadata
+                    )
+                    upload_id = upload['UploadId']
+                parts.append(await self._upload_part(audio_s3_key, upload_id, len(parts) + 1, bytes(buffer)))
+                size += len(buffer)
+                buffer = bytearray()
+
+            if upload_id is None:
+                await io_executor.run(
+                    "s3", s3_client.put_object,
+                    Bucket=bucket, Key=audio_s3_key, Body=bytes(buffer), ContentType='audio/mpeg', Metadata=metadata
+                )
+            else:
+                if buffer:
+                    parts.append(await self._upload_part(audio_s3_key, upload_id, len(parts) + 1, bytes(buffer)))
+                await io_executor.run(
+                    "s3", s3_client.complete_multipart_upload,
+                    Bucket=bucket, Key=audio_s3_key, UploadId=upload_id, MultipartUpload={'Parts': parts}
+                )
+            return size + len(buffer)
+
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            # Let every synthesis finish unwinding before the upload it feeds is aborted
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if upload_id is not None:
                 try:
-                    while True:
-                        chunk = audio_stream.read(8192)
-                        if not chunk:
-                            break
-                        yield chunk
-                finally:
-                    audio_stream.close()
-
-            return StreamingResponse(
-                generate(),
-                media_type="audio/mpeg",
-                headers={
-                    "Content-Disposition": f"inline; filename={audio_s3_key.split('/')[-1]}",
-                    "Accept-Ranges": "bytes"
-                }
-            )
+                    await io_executor.run(
+                        "s3", s3_client.abort_multipart_upload, Bucket=bucket, Key=audio_s3_key, UploadId=upload_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to abort multipart upload for {audio_s3_key}: {e}")
+            raise
+
+    async def _upload_part(self, audio_s3_key: str, upload_id: str, part_number: int, data: bytes) -> Dict[str, Any]:
+        response = await io_executor.run(
+            "s3", s3_service.s3_client.upload_part,
+            Bucket=s3_service.bucket_name, Key=audio_s3_key, UploadId=upload_id, PartNumber=part_number, Body=data
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+
+    def _synthesize(self, text: str, voice_id: str) -> bytes:
+        """Blocking Polly call; run it through io_executor from async code"""
+        response = self.polly_client.synthesize_speech(
+            Text=text,
+            OutputFormat='mp3',
+            VoiceId=voice_id,
+            Engine=self._engine(voice_id)
+        )
+        return response['AudioStream'].read()
 
+    async def stream_audio(self, audio_s3_key: str, range_header: Optional[str] = None,
+                           redirect: bool = False):
+        """Stream audio file from S3, honouring a single-range `Range` header
+
+        Ranges are passed through to S3 as ranged GETs and answered with 206, or
+        416 when they cannot be satisfied. With redirect=True the client is sent
+        to a presigned URL instead, so the bytes bypass this service.
+        """
+        if redirect:
+            return RedirectResponse(s3_service.get_presigned_url(audio_s3_key), status_code=307)
+
+        byte_range = self._parse_range(range_header)
+        request_args = {"Bucket": s3_service.bucket_name, "Key": audio_s3_key}
+        if byte_range:
+            request_args["Range"] = byte_range
+
+        try:
+            response = await io_executor.run("s3", s3_service.s3_client.get_object, **request_args)
+        except s3_service.s3_client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                size = await self._cached_size(audio_s3_key)
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{size or 0}"})
+            raise HTTPException(status_code=404, detail=f"Audio file not found: {str(e)}")
         except Exception as e:
             raise HTTPException(status_code=404, detail=f"Audio file not found: {str(e)}")
 
-    async def find_audio_file(self, audio_id: str) -> str:
-        """Find audio file in S3 by audio ID"""
+        audio_stream = response['Body']
+        chunk_size = settings.AUDIO_STREAM_CHUNK_SIZE
+
+        def generate():
+            try:
+                while True:
+                    chunk = audio_stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                audio_stream.close()
+
+        headers = {
+            "Content-Disposition": f"inline; filename={audio_s3_key.split('/')[-1]}",
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(response.get('ContentLength', 0))
+        }
+        status_code = 200
+        if byte_range and response.get('ContentRange'):
+            headers["Content-Range"] = response['ContentRange']
+            status_code = 206
+
+        return StreamingResponse(generate(), status_code=status_code, media_type="audio/mpeg", headers=headers)
+
+    def _parse_range(self, range_header: Optional[str]) -> Optional[str]:
+        """Normalize a single `bytes=start-end` / `bytes=start-` / `bytes=-suffix` range; anything else means the whole file"""
+        if not range_header:
+            return None
+        match = RANGE_PATTERN.match(range_header.strip().replace(" ", ""))
+        if not match or not (match.group(1) or match.group(2)):
+            return None
+        start, end = match.groups()
+        if start and end and int(end) < int(start):
+            return None
+        return f"bytes={start}-{end}"
+
+    async def find_audio_file(self, audio_id: str, db: Optional[AsyncSession] = None) -> str:
+        """Find audio file in S3 by audio ID or analysis job ID"""
+        if audio_id.startswith('tts_') and not audio_id.endswith('.mp3'):
+            return f"audio/{audio_id}.mp3"
+
         if not audio_id.endswith('.mp3'):
-            response = s3_service.s3_client.list_objects_v2(
+            # Job audio is recorded in user_audio_files; with the TTS cache its key is
+            # content-addressed and no longer contains the job ID
+            if db is not None:
+                audio_s3_key = await database_service.get_audio_s3_key_for_job_async(db, audio_id)
+                if audio_s3_key:
+                    return audio_s3_key
+
+            response = await io_executor.run(
+                "s3",
+                s3_service.s3_client.list_objects_v2,
                 Bucket=s3_service.bucket_name,
                 Prefix=f"audio/",
                 MaxKeys=100
@@ -24,11 +24,67 @@ class Settings(BaseSettings):
     BEDROCK_MAX_TOKENS: int = 4000
     YOUTUBE_LAMBDA_NAME: Optional[str] = None
 
+    VISUAL_MAX_CONCURRENCY: int = 4
+    VISUAL_TIMEOUT_SECONDS: float = 60.0
+
+    SUMMARY_STREAMING: bool = True
+    SUMMARY_STREAM_FLUSH_CHARS: int = 200
+    SUMMARY_SINGLE_PASS_TOKENS: int = 6000
+    SUMMARY_CHUNK_TOKENS: int = 3000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    SUMMARY_REDUCE_FANIN: int = 6
+    SUMMARY_CHUNK_CACHE_BACKEND: str = "memory"
+    SUMMARY_CHUNK_CACHE_MAX_ENTRIES: int = 2048
+    SUMMARY_CHUNK_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    SUMMARY_CHUNK_CACHE_PREFIX: str = "cache/summary_chunks"
+
+    REPORT_PIPELINE_VERSION: str = "1"
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_PREFIX: str = "cache/reports"
+    REPORT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    REPORT_CACHE_MAX_ENTRIES: int = 1000
+    REPORT_COMPRESSION: str = "gzip"
+    REPORT_COMPRESSION_LEVEL: int = 6
+
+    REPORT_QUEUE_BACKEND: str = "memory"
+    REPORT_QUEUE_MAX_PENDING: int = 100
+    REPORT_QUEUE_MAX_PENDING_PER_USER: int = 3
+    REPORT_QUEUE_MAX_ATTEMPTS: int = 2
+    REPORT_QUEUE_VISIBILITY_TIMEOUT_SECONDS: int = 1800
+    REPORT_QUEUE_HEARTBEAT_SECONDS: int = 60
+    REPORT_QUEUE_POLL_INTERVAL_SECONDS: float = 2.0
+    REPORT_QUEUE_RETRY_AFTER_SECONDS: int = 30
+    REPORT_WORKER_PROCESSES: int = 2
+    REPORT_WORKER_THREADS: int = 2
+
     POLLY_VOICE_ID: str = "Seoyeon"
+    POLLY_CHUNK_CHARS: int = 2800
+    POLLY_MAX_CONCURRENCY: int = 4
+    AUDIO_MULTIPART_PART_SIZE: int = 5 * 1024 * 1024
+    TTS_CACHE_ENABLED: bool = True
+    AUDIO_STREAM_REDIRECT: bool = False
+    AUDIO_STREAM_CHUNK_SIZE: int = 64 * 1024
+
+    S3_POOL_SIZE: int = 16
+    S3_HEAD_CONCURRENCY: int = 16
+    PRESIGNED_URL_CACHE_MAX_ENTRIES: int = 4096
+    PRESIGNED_URL_MIN_REMAINING_RATIO: float = 0.5
+    POLLY_POOL_SIZE: int = 8
+    BEDROCK_POOL_SIZE: int = 8
+    HTTP_POOL_SIZE: int = 16
 
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
 
     VIDCAP_API_KEY: str = ""
+    VIDCAP_TIMEOUT_SECONDS: float = 30.0
+
+    CAPTION_LOCALE: str = "ko"
+    CAPTION_CACHE_BACKEND: str = "memory"
+    CAPTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    CAPTION_NEGATIVE_TTL_SECONDS: int = 3600
+    CAPTION_CACHE_MAX_ENTRIES: int = 512
+    CAPTION_CACHE_DIR: str = "/tmp/caption_cache"
+    CAPTION_CACHE_PREFIX: str = "cache/captions"
 
     YOUTUBE_API_KEY: Optional[str] = None
 
@@ -42,6 +98,18 @@ class Settings(BaseSettings):
     COGNITO_CLIENT_SECRET: Optional[str] = None
     
     DATABASE_URL: Optional[str] = None
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
+    REDIS_URL: Optional[str] = None
+    PROGRESS_TTL_SECONDS: int = 24 * 3600
+    PROGRESS_STREAM_POLL_SECONDS: float = 0.5
+    PROGRESS_STREAM_KEEPALIVE_SECONDS: float = 15.0
 
     model_config = ConfigDict(
         env_file=".env",
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from core.config import settings
+
+
+class IOExecutor:
+    """Per-service thread pools that let async code await blocking boto3/requests calls
+
+    Each service ("s3", "polly", "bedrock", "http", "db") gets its own pool, so a burst
+    of slow uploads cannot starve Polly or Bedrock calls, and none of them run on
+    the event loop.
+
+    Agents that fan out Bedrock calls within one job (summary map/reduce,
+    visualizations) keep their own pool instead of submitting to "bedrock", which
+    already runs the job itself and could deadlock waiting on its own queue. Those
+    pools belong to the singleton agent, not to a job, so they are shared across
+    jobs and the number of in-flight Bedrock calls stays bounded per process.
+    """
+
+    def __init__(self, pool_sizes: Dict[str, int], default_size: int = 4):
+        self.pool_sizes = pool_sizes
+        self.default_size = default_size
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, service: str) -> ThreadPoolExecutor:
+        with self._lock:
+            if service not in self._pools:
+                self._pools[service] = ThreadPoolExecutor(
+                    max_workers=self.pool_sizes.get(service, self.default_size),
+                    thread_name_prefix=f"io-{service}"
+                )
+            return self._pools[service]
+
+    async def run(self, service: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the service's pool and await the result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool(service), functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False)
+            self._pools.clear()
+
+
+io_executor = IOExecutor({
+    "s3": settings.S3_POOL_SIZE,
+    "polly": settings.POLLY_POOL_SIZE,
+    "bedrock": settings.BEDROCK_POOL_SIZE,
+    "http": settings.HTTP_POOL_SIZE,
+    "db": settings.DB_POOL_SIZE
+})
@@ -1,16 +1,97 @@
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _pool_options(url: str) -> dict:
+    """Pool sizing and connection settings from config; SQLite (local/dev) keeps its own pool"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+def _sync_connect_args(url: str) -> dict:
+    if make_url(url).get_backend_name() != "postgresql" or not settings.DB_STATEMENT_TIMEOUT_MS:
+        return {}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+
+def _async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL with its driver switched to asyncpg
+
+    The models use PostgreSQL JSONB/UUID columns, so only PostgreSQL URLs are accepted.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend != "postgresql":
+        raise ValueError(f"No async driver for DATABASE_URL backend '{backend}'; set ASYNC_DATABASE_URL")
+    return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=_sync_connect_args(settings.DATABASE_URL),
+    **_pool_options(settings.DATABASE_URL)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """Create the asyncpg engine on first use so sync-only processes never import asyncpg"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        async_url = _async_database_url()
+        connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS and make_url(async_url).get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+        async_engine = create_async_engine(async_url, connect_args=connect_args, **_pool_options(async_url))
+        _async_sessionmaker = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator:
+    """Request-scoped AsyncSession for routers"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Session owned by a background worker: commits on success, rolls back on error, always closes"""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -21,6 +21,12 @@ class UserAnalysisJob(Base):
     reports = relationship("UserReport", back_populates="job")
     audio_files = relationship("UserAudioFile", back_populates="job")
 
+    __table_args__ = (
+        # Keyset listing: WHERE user_id [AND job_type] ORDER BY created_at DESC, id DESC
+        Index("ix_user_analysis_jobs_user_type_created", "user_id", "job_type",
+              created_at.desc(), id.desc()),
+    )
+
 class UserReport(Base):
     __tablename__ = "user_reports"
     
@@ -31,9 +37,24 @@ class UserReport(Base):
     s3_key = Column(String(500))
     file_type = Column(String(10))  # 'json', 'txt', 'pdf'
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Copied from the report's S3 metadata at write time so listings never touch S3
+    status = Column(String(20), default='completed')
+    analysis_type = Column(String(50))
+    youtube_url = Column(String(500))
+    youtube_title = Column(String(500))
+    youtube_channel = Column(String(255))
+    youtube_duration = Column(String(50))
+    youtube_thumbnail = Column(String(500))
+    video_id = Column(String(32))
     
     job = relationship("UserAnalysisJob", back_populates="reports")
 
+    __table_args__ = (
+        Index("ix_user_reports_job_id_user_id", "job_id", "user_id"),
+        Index("ix_user_reports_user_created", "user_id", created_at.desc(), id.desc()),
+    )
+
 class UserAudioFile(Base):
     __tablename__ = "user_audio_files"
     
@@ -44,4 +65,27 @@ class UserAudioFile(Base):
     duration = Column(Integer) 
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    job = relationship("UserAnalysisJob", back_populates="audio_files")
\ No newline at end of file
+    job = relationship("UserAnalysisJob", back_populates="audio_files")
+
+    __table_args__ = (
+        Index("ix_user_audio_files_job_id", "job_id"),
+    )
+
+class ReportJobQueueEntry(Base):
+    __tablename__ = "report_job_queue"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("user_analysis_jobs.id"), nullable=False, index=True)
+    user_id = Column(String(255), nullable=False, index=True)
+    payload = Column(JSONB)
+    status = Column(String(20), default='queued')  # 'queued', 'running', 'done', 'failed'
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+    available_at = Column(DateTime, default=datetime.utcnow)
+    locked_by = Column(String(255))
+    locked_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_report_job_queue_status_available_at", "status", "available_at"),
+    )
@@ -1,27 +1,37 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import uuid
 
-from database.models.database_models import UserAnalysisJob, UserReport, UserAudioFile
+from database.models.database_models import UserAnalysisJob, UserReport, UserAudioFile, ReportJobQueueEntry
 from database.core.database import get_db
+from database.core.pagination import encode_cursor, decode_cursor
 
 class DatabaseService:
-    def create_analysis_job(self, db: Session, user_id: str, job_type: str, input_data: dict) -> UserAnalysisJob:
-   
+    def create_analysis_job(self, db: Session, user_id: str, job_type: str, input_data: dict,
+                            commit: bool = True, job_id: Optional[str] = None) -> UserAnalysisJob:
+        """Add a job row; with commit=False it is only flushed, so the caller's transaction owns it"""
         job = UserAnalysisJob(
             user_id=user_id,
             job_type=job_type,
             input_data=input_data,
             status="processing"
         )
+        if job_id:
+            job.id = uuid.UUID(job_id)
         db.add(job)
+        if not commit:
+            db.flush()
+            return job
         db.commit()
         db.refresh(job)
         return job
     
-    def update_job_status(self, db: Session, job_id: str, status: str, result_s3_key: str = None):
-
+    def update_job_status(self, db: Session, job_id: str, status: str, result_s3_key: str = None,
+                          commit: bool = True):
+        """Set the job status; with commit=False the change joins the caller's transaction"""
         job = db.query(UserAnalysisJob).filter(UserAnalysisJob.id == job_id).first()
         if job:
             job.status = status
@@ -29,7 +39,8 @@ class DatabaseService:
                 job.result_s3_key = result_s3_key
             if status == "completed":
                 job.completed_at = datetime.utcnow()
-            db.commit()
+            if commit:
+                db.commit()
     
     def get_user_jobs(self, db: Session, user_id: str, limit: int = 50) -> List[UserAnalysisJob]:
 
@@ -37,6 +48,32 @@ class DatabaseService:
             UserAnalysisJob.user_id == user_id
         ).order_by(UserAnalysisJob.created_at.desc()).limit(limit).all()
     
+    async def list_user_jobs(self, db: AsyncSession, user_id: str, job_type: Optional[str] = None,
+                             status: Optional[str] = None, limit: int = 20,
+                             cursor: Optional[str] = None) -> Tuple[List[UserAnalysisJob], Optional[str]]:
+        """Keyset page of a user's jobs, newest first; returns (jobs, next_cursor)
+
+        Raises InvalidCursorError for a malformed cursor.
+        """
+        query = select(UserAnalysisJob).where(UserAnalysisJob.user_id == user_id)
+        if job_type:
+            query = query.where(UserAnalysisJob.job_type == job_type)
+        if status:
+            query = query.where(UserAnalysisJob.status == status)
+
+        position = decode_cursor(cursor)
+        if position:
+            query = query.where(tuple_(UserAnalysisJob.created_at, UserAnalysisJob.id) < tuple_(*position))
+
+        query = query.order_by(UserAnalysisJob.created_at.desc(), UserAnalysisJob.id.desc()).limit(limit + 1)
+        jobs = list((await db.execute(query)).scalars().all())
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = encode_cursor(jobs[-1].created_at, jobs[-1].id)
+        return jobs, next_cursor
+    
     def get_job_by_id(self, db: Session, job_id: str, user_id: str) -> Optional[UserAnalysisJob]:
 
         return db.query(UserAnalysisJob).filter(
@@ -44,13 +81,39 @@ class DatabaseService:
             UserAnalysisJob.user_id == user_id
         ).first()
     
+    async def get_job_by_id_async(self, db: AsyncSession, job_id: str, user_id: str) -> Optional[UserAnalysisJob]:
+
+        result = await db.execute(
+            select(UserAnalysisJob).where(
+                UserAnalysisJob.id == job_id,
+                UserAnalysisJob.user_id == user_id
+            )
+        )
+        return result.scalars().first()
+    
+    async def get_job_with_results_async(self, db: AsyncSession, job_id: str, user_id: str) -> Optional[UserAnalysisJob]:
+        """Job row with its reports and audio files loaded in the same round of queries"""
+        result = await db.execute(
+            select(UserAnalysisJob).where(
+                UserAnalysisJob.id == job_id,
+                UserAnalysisJob.user_id == user_id
+            ).options(
+                selectinload(UserAnalysisJob.reports),
+                selectinload(UserAnalysisJob.audio_files)
+            )
+        )
+        return result.scalars().first()
+    
+    def create_user_report(self, db: Session, job_id: str, user_id: str, title: str, s3_key: str, file_type: str = "json",
+                           metadata: Optional[Dict[str, Any]] = None) -> UserReport:
 
         report = UserReport(
             job_id=job_id,
             user_id=user_id,
             title=title,
             s3_key=s3_key,
-            file_type=file_type
+            file_type=file_type,
+            **self.report_metadata_columns(metadata or {})
         )
         db.add(report)
         db.commit()
@@ -70,6 +133,54 @@ class DatabaseService:
         db.refresh(audio)
         return audio
     
+    async def get_audio_s3_key_for_job_async(self, db: AsyncSession, job_id: str) -> Optional[str]:
+        """S3 key of the newest audio file recorded for a job (TTS-cached audio has no job ID in its key)"""
+        try:
+            job_uuid = uuid.UUID(str(job_id))
+        except ValueError:
+            return None
+        result = await db.execute(
+            select(UserAudioFile.s3_key)
+            .where(UserAudioFile.job_id == job_uuid)
+            .order_by(UserAudioFile.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+    
+    def report_metadata_columns(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the report JSON's metadata block onto the denormalized user_reports columns"""
+        return {
+            "status": metadata.get("status", "completed"),
+            "analysis_type": metadata.get("analysis_type"),
+            "youtube_url": metadata.get("youtube_url"),
+            "youtube_title": metadata.get("youtube_title"),
+            "youtube_channel": metadata.get("youtube_channel"),
+            "youtube_duration": metadata.get("youtube_duration"),
+            "youtube_thumbnail": metadata.get("youtube_thumbnail"),
+            "video_id": metadata.get("video_id")
+        }
+
+    async def list_user_reports_async(self, db: AsyncSession, user_id: str, limit: int = 100,
+                                      cursor: Optional[str] = None) -> Tuple[List[UserReport], Optional[str]]:
+        """Keyset page of a user's reports, newest first; returns (reports, next_cursor)
+
+        Raises InvalidCursorError for a malformed cursor.
+        """
+        query = select(UserReport).where(UserReport.user_id == user_id)
+
+        position = decode_cursor(cursor)
+        if position:
+            query = query.where(tuple_(UserReport.created_at, UserReport.id) < tuple_(*position))
+
+        query = query.order_by(UserReport.created_at.desc(), UserReport.id.desc()).limit(limit + 1)
+        reports = list((await db.execute(query)).scalars().all())
+
+        next_cursor = None
+        if len(reports) > limit:
+            reports = reports[:limit]
+            next_cursor = encode_cursor(reports[-1].created_at, reports[-1].id)
+        return reports, next_cursor
+    
     def get_user_reports(self, db: Session, user_id: str, limit: int = 50) -> List[UserReport]:
    
         return db.query(UserReport).filter(
@@ -81,6 +192,25 @@ class DatabaseService:
             UserAudioFile.user_id == user_id
         ).order_by(UserAudioFile.created_at.desc()).limit(limit).all()
     
+    def get_user_file_metadata(self, db: Session, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """S3 object metadata ({user_id, job_id, created_at}) for every report and audio file the user owns, by key"""
+        rows = db.query(UserReport.s3_key, UserReport.job_id, UserReport.created_at).filter(
+            UserReport.user_id == user_id
+        ).union_all(
+            db.query(UserAudioFile.s3_key, UserAudioFile.job_id, UserAudioFile.created_at).filter(
+                UserAudioFile.user_id == user_id
+            )
+        ).all()
+        return {
+            s3_key: {
+                "user_id": user_id,
+                "job_id": str(job_id),
+                "created_at": created_at.isoformat() if created_at else ""
+            }
+            for s3_key, job_id, created_at in rows
+            if s3_key
+        }
+    
     def delete_job(self, db: Session, job_id: str, user_id: str) -> bool:
         job = db.query(UserAnalysisJob).filter(
             UserAnalysisJob.id == job_id,
@@ -90,6 +220,7 @@ class DatabaseService:
         if job:
             db.query(UserReport).filter(UserReport.job_id == job_id).delete()
             db.query(UserAudioFile).filter(UserAudioFile.job_id == job_id).delete()
+            db.query(ReportJobQueueEntry).filter(ReportJobQueueEntry.job_id == job_id).delete()
             db.delete(job)
             db.commit()
             return True
@@ -1,9 +1,14 @@
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from analyze.routers.youtube_analyze import router as analysis_router
 from audio.routers.audio_service import router as audio_router
 from s3.routers.s3 import router as report_router
 from s3.routers.s3 import router as s3_router
+from core.config import settings
+from core.io_executor import io_executor
+from worker.services.job_queue import job_queue
+from worker.services.report_worker import start_worker_threads
 #from routers.user_analysis import router as user_analysis_router
 
 app = FastAPI()
@@ -29,6 +34,20 @@ app.include_router(analysis_router, prefix="/analyze")
 app.include_router(s3_router, prefix="/s3")
 #app.include_router(user_analysis_router, prefix="/user_analysis")
 
+worker_stop_event = threading.Event()
+
+@app.on_event("startup")
+def start_in_process_workers():
+    # The in-memory queue is only visible to this process, so it is drained here;
+    # with the Postgres queue the workers run as `python -m worker.main`
+    if settings.REPORT_QUEUE_BACKEND.lower() == "memory":
+        start_worker_threads(job_queue, settings.REPORT_WORKER_THREADS, worker_stop_event)
+
+@app.on_event("shutdown")
+def stop_in_process_workers():
+    worker_stop_event.set()
+    io_executor.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Hello from analyzer_service!"}
@@ -0,0 +1,61 @@
+"""Initial report tables: user_analysis_jobs, user_reports, user_audio_files
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_analysis_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String(255), nullable=False),
+        sa.Column("job_type", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20)),
+        sa.Column("input_data", postgresql.JSONB()),
+        sa.Column("result_s3_key", sa.String(500)),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("completed_at", sa.DateTime())
+    )
+    op.create_index("ix_user_analysis_jobs_user_id", "user_analysis_jobs", ["user_id"])
+
+    op.create_table(
+        "user_reports",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("user_analysis_jobs.id")),
+        sa.Column("user_id", sa.String(255), nullable=False),
+        sa.Column("title", sa.String(500)),
+        sa.Column("s3_key", sa.String(500)),
+        sa.Column("file_type", sa.String(10)),
+        sa.Column("created_at", sa.DateTime())
+    )
+    op.create_index("ix_user_reports_user_id", "user_reports", ["user_id"])
+
+    op.create_table(
+        "user_audio_files",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("user_analysis_jobs.id")),
+        sa.Column("user_id", sa.String(255), nullable=False),
+        sa.Column("s3_key", sa.String(500)),
+        sa.Column("duration", sa.Integer()),
+        sa.Column("created_at", sa.DateTime())
+    )
+    op.create_index("ix_user_audio_files_user_id", "user_audio_files", ["user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_user_audio_files_user_id", table_name="user_audio_files")
+    op.drop_table("user_audio_files")
+    op.drop_index("ix_user_reports_user_id", table_name="user_reports")
+    op.drop_table("user_reports")
+    op.drop_index("ix_user_analysis_jobs_user_id", table_name="user_analysis_jobs")
+    op.drop_table("user_analysis_jobs")
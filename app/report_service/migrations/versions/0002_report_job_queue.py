@@ -0,0 +1,41 @@
+"""Durable report job queue table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "report_job_queue",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("user_analysis_jobs.id"), nullable=False),
+        sa.Column("user_id", sa.String(255), nullable=False),
+        sa.Column("payload", postgresql.JSONB()),
+        sa.Column("status", sa.String(20)),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("available_at", sa.DateTime()),
+        sa.Column("locked_by", sa.String(255)),
+        sa.Column("locked_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime())
+    )
+    op.create_index("ix_report_job_queue_job_id", "report_job_queue", ["job_id"])
+    op.create_index("ix_report_job_queue_user_id", "report_job_queue", ["user_id"])
+    op.create_index("ix_report_job_queue_status_available_at", "report_job_queue", ["status", "available_at"])
+
+
+def downgrade():
+    op.drop_index("ix_report_job_queue_status_available_at", table_name="report_job_queue")
+    op.drop_index("ix_report_job_queue_user_id", table_name="report_job_queue")
+    op.drop_index("ix_report_job_queue_job_id", table_name="report_job_queue")
+    op.drop_table("report_job_queue")
@@ -0,0 +1,33 @@
+"""Composite index for keyset job listing
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction; keeps writes flowing on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_analysis_jobs_user_type_created",
+            "user_analysis_jobs",
+            ["user_id", "job_type", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_user_analysis_jobs_user_type_created",
+            table_name="user_analysis_jobs",
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,34 @@
+"""Index user_reports on (job_id, user_id) and user_audio_files on job_id for direct result lookups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_reports_job_id_user_id",
+            "user_reports",
+            ["job_id", "user_id"],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_user_audio_files_job_id",
+            "user_audio_files",
+            ["job_id"],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_user_audio_files_job_id", table_name="user_audio_files", postgresql_concurrently=True)
+        op.drop_index("ix_user_reports_job_id_user_id", table_name="user_reports", postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""Denormalize report metadata into user_reports for SQL-only listings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+METADATA_COLUMNS = [
+    sa.Column("status", sa.String(20)),
+    sa.Column("analysis_type", sa.String(50)),
+    sa.Column("youtube_url", sa.String(500)),
+    sa.Column("youtube_title", sa.String(500)),
+    sa.Column("youtube_channel", sa.String(255)),
+    sa.Column("youtube_duration", sa.String(50)),
+    sa.Column("youtube_thumbnail", sa.String(500)),
+    sa.Column("video_id", sa.String(32))
+]
+
+
+def upgrade():
+    # Nullable columns without defaults: no table rewrite. Existing rows keep
+    # youtube_url NULL and are backfilled from S3 the first time they are listed.
+    for column in METADATA_COLUMNS:
+        op.add_column("user_reports", column)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_reports_user_created",
+            "user_reports",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_user_reports_user_created", table_name="user_reports", postgresql_concurrently=True)
+
+    for column in reversed(METADATA_COLUMNS):
+        op.drop_column("user_reports", column.name)
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Header
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List, Optional
 from report_service.s3.services.s3_service import s3_service
 from report_service.core.config import settings
+from core.io_executor import io_executor
+from database.core.database import get_async_db
+from database.core.pagination import InvalidCursorError
+from database.services.database_service import database_service
+import asyncio
 import json
 import requests
 
@@ -41,7 +47,7 @@ async def list_s3_objects(
     - **max_keys**: Maximum number of objects to retrieve
     """
     try:
-        objects = s3_service.list_objects(prefix=prefix, max_keys=max_keys)
+        objects = await io_executor.run("s3", s3_service.list_objects, prefix=prefix, max_keys=max_keys)
         
         return {
             "bucket": s3_service.bucket_name,
@@ -70,16 +76,14 @@ async def get_s3_object(key: str) -> Dict[str, Any]:
     - **key**: Object key (path)
     """
     try:
-        response = s3_service.s3_client.head_object(
+        response = await io_executor.run(
+            "s3",
+            s3_service.s3_client.head_object,
             Bucket=s3_service.bucket_name,
             Key=key
         )
         
-        url = s3_service.s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': s3_service.bucket_name, 'Key': key},
-            ExpiresIn=3600
-        )
+        url = s3_service.get_presigned_url(key)
         
         return {
             "key": key,
@@ -94,54 +98,91 @@ async def get_s3_object(key: str) -> Dict[str, Any]:
 
 
 @router.get("/reports/list")
-async def list_reports_with_metadata(current_user: dict = Depends(get_current_user)) -> List[Dict[str, Any]]:
+async def list_reports_with_metadata(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of reports"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_urls: bool = Query(True, description="Presign download URLs (set false and use /s3/object/{key} on demand)"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Dict[str, Any]]:
     """
-    List user reports with metadata
+    List user reports with metadata, newest first
+
+    Served from the user_reports table; the next page's cursor is returned in the X-Next-Cursor header.
     """
     try:
         user_id = current_user["user_id"]
-        report_objects = s3_service.list_objects(prefix=f"reports/{user_id}/", max_keys=100)
-        
-        reports = []
-        for obj in report_objects:
-            if obj.get("Key", "").endswith("_report.json"):
-                try:
-                    report_content = s3_service.get_file_content(obj.get("Key", ""))
-                    if report_content:
-                        report_data = json.loads(report_content)
-                        job_id = obj.get("Key", "").replace(f"reports/{user_id}/", "").replace("_report.json", "")
-                        metadata = report_data.get("metadata", {})
-                        
-                        report_url = s3_service.s3_client.generate_presigned_url(
-                            'get_object',
-                            Params={'Bucket': s3_service.bucket_name, 'Key': obj.get("Key", "")},
-                            ExpiresIn=3600
-                        )
-                        
-                        reports.append({
-                            "id": job_id,
-                            "key": obj.get("Key", ""),
-                            "title": metadata.get("youtube_title", f"YouTube Report - {job_id[:8]}"),
-                            "youtube_url": metadata.get("youtube_url", ""),
-                            "youtube_channel": metadata.get("youtube_channel", "Unknown Channel"),
-                            "youtube_duration": metadata.get("youtube_duration", "Unknown"),
-                            "youtube_thumbnail": metadata.get("youtube_thumbnail", ""),
-                            "video_id": metadata.get("video_id", ""),
-                            "type": "YouTube",
-                            "analysis_type": metadata.get("analysis_type", "youtube_analysis"),
-                            "status": metadata.get("status", "completed"),
-                            "last_modified": obj.get("LastModified", "").isoformat() if hasattr(obj.get("LastModified", ""), "isoformat") else obj.get("LastModified", ""),
-                            "url": report_url,
-                            "metadata": metadata
-                        })
-                        
-                except Exception as e:
-                    print(f"Failed to process report: {obj.get('Key', '')} - {e}")
-                    continue
-        
-        reports.sort(key=lambda x: x.get("last_modified", ""), reverse=True)
-        
-        return reports
-        
+        reports, next_cursor = await database_service.list_user_reports_async(db, user_id, limit=limit, cursor=cursor)
+        await _backfill_legacy_metadata(db, reports)
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        results = []
+        for report in reports:
+            job_id = str(report.job_id)
+            metadata = {
+                "job_id": job_id,
+                "user_id": report.user_id,
+                "youtube_url": report.youtube_url or "",
+                "created_at": report.created_at.isoformat(),
+                "service": "youtube_reporter",
+                "analysis_type": report.analysis_type or "youtube_analysis",
+                "status": report.status or "completed",
+                "youtube_title": report.youtube_title or "",
+                "youtube_channel": report.youtube_channel or "",
+                "youtube_duration": report.youtube_duration or "",
+                "youtube_thumbnail": report.youtube_thumbnail or "",
+                "video_id": report.video_id or ""
+            }
+
+            results.append({
+                "id": job_id,
+                "key": report.s3_key,
+                "title": report.youtube_title or report.title or f"YouTube Report - {job_id[:8]}",
+                "youtube_url": metadata["youtube_url"],
+                "youtube_channel": report.youtube_channel or "Unknown Channel",
+                "youtube_duration": report.youtube_duration or "Unknown",
+                "youtube_thumbnail": metadata["youtube_thumbnail"],
+                "video_id": metadata["video_id"],
+                "type": "YouTube",
+                "analysis_type": metadata["analysis_type"],
+                "status": metadata["status"],
+                "last_modified": metadata["created_at"],
+                "url": s3_service.get_presigned_url(report.s3_key) if include_urls else None,
+                "metadata": metadata
+            })
+
+        return results
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve report list: {str(e)}")
+
+
+async def _backfill_legacy_metadata(db: AsyncSession, reports: list):
+    """Fill the metadata columns of reports written before they existed, once, from the S3 JSON"""
+    legacy = [report for report in reports if report.youtube_url is None and report.s3_key]
+    if not legacy:
+        return
+
+    contents = await asyncio.gather(
+        *(io_executor.run("s3", s3_service.get_file_content, report.s3_key) for report in legacy),
+        return_exceptions=True
+    )
+    for report, content in zip(legacy, contents):
+        if isinstance(content, Exception) or not content:
+            print(f"Failed to backfill report metadata: {report.s3_key} - {content}")
+            continue
+        try:
+            metadata = json.loads(content).get("metadata", {})
+        except ValueError:
+            continue
+        for column, value in database_service.report_metadata_columns(metadata).items():
+            setattr(report, column, value)
+        if report.youtube_url is None:
+            report.youtube_url = ""
+
+    await db.commit()
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from botocore.credentials import RefreshableCredentials
+
+from core.cache import TTLCache
+from core.config import settings
+
+# botocore refreshes temporary credentials once fewer than 10 minutes remain, so a URL
+# signed with them stays valid for at least that long; reuse it for half of that
+REFRESHABLE_CREDENTIALS_MAX_TTL_SECONDS = 300
+
+
+def credentials_max_ttl(credentials) -> Optional[float]:
+    """How long a URL signed with these credentials may be cached; None if they never expire
+
+    botocore exposes no public expiry time, so temporary credentials (instance
+    profile, IRSA, assumed roles) get the conservative REFRESHABLE_CREDENTIALS_MAX_TTL_SECONDS.
+    """
+    if isinstance(credentials, RefreshableCredentials):
+        return REFRESHABLE_CREDENTIALS_MAX_TTL_SECONDS
+    return None
+
+
+class PresignedUrlCache:
+    """Process-wide cache of presigned GET URLs, shared by UserS3Service and S3Service
+
+    Entries are keyed by (bucket, key, expires_in) and are reused only while at
+    least PRESIGNED_URL_MIN_REMAINING_RATIO of their validity is left, so callers
+    always receive a URL that stays valid for most of the window they asked for.
+    With temporary credentials (instance profile, IRSA) a URL also stops working
+    when the signing credentials expire, so callers pass max_ttl from
+    credentials_max_ttl() to keep entries from outliving them.
+    """
+
+    def __init__(self, max_entries: int, min_remaining_ratio: float):
+        self.min_remaining_ratio = min(max(min_remaining_ratio, 0.0), 1.0)
+        self.cache = TTLCache(max_entries=max_entries)
+
+    def get_url(self, s3_client, bucket: str, key: str, expires_in: int = 3600,
+                max_ttl: Optional[float] = None) -> str:
+        cache_key = (bucket, key, expires_in)
+        url = self.cache.get(cache_key)
+        if url is None:
+            url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': bucket, 'Key': key},
+                ExpiresIn=expires_in
+            )
+            ttl = expires_in * (1 - self.min_remaining_ratio)
+            if max_ttl is not None:
+                ttl = min(ttl, max_ttl)
+            if ttl > 0:
+                self.cache.set(cache_key, url, ttl=ttl)
+        return url
+
+    def invalidate(self, bucket: str, key: str):
+        """Drop cached URLs for a deleted object"""
+        self.cache.delete_matching(lambda cache_key: cache_key[:2] == (bucket, key))
+
+
+presigned_url_cache = PresignedUrlCache(
+    max_entries=settings.PRESIGNED_URL_CACHE_MAX_ENTRIES,
+    min_remaining_ratio=settings.PRESIGNED_URL_MIN_REMAINING_RATIO
+)
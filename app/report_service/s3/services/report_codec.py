@@ -0,0 +1,60 @@
+import gzip
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def encode_json(data: Any, compression: Optional[str] = None) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize data as compact UTF-8 JSON, compressed per REPORT_COMPRESSION
+
+    Returns the body and the put_object arguments (ContentType, ContentEncoding)
+    that describe it. zstd falls back to gzip when `zstandard` is not installed.
+    """
+    compression = (compression or settings.REPORT_COMPRESSION).lower()
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {"ContentType": "application/json; charset=utf-8"}
+
+    if compression == "zstd" and zstandard is None:
+        logger.warning("REPORT_COMPRESSION=zstd but zstandard is not installed, using gzip")
+        compression = "gzip"
+
+    if compression == "zstd":
+        body = zstandard.ZstdCompressor(level=settings.REPORT_COMPRESSION_LEVEL).compress(body)
+        headers["ContentEncoding"] = "zstd"
+    elif compression == "gzip":
+        body = gzip.compress(body, compresslevel=min(9, settings.REPORT_COMPRESSION_LEVEL))
+        headers["ContentEncoding"] = "gzip"
+    elif compression != "none":
+        logger.warning(f"Unknown REPORT_COMPRESSION '{compression}', storing uncompressed")
+
+    return body, headers
+
+
+def decode_body(body: bytes, content_encoding: Optional[str] = None) -> str:
+    """Decode an S3 object body to text, whatever format it was written in
+
+    Handles gzip and zstd (by Content-Encoding or magic bytes) as well as the
+    legacy uncompressed, indented JSON objects.
+    """
+    encoding = (content_encoding or "").lower()
+
+    if encoding == "gzip" or body[:2] == GZIP_MAGIC:
+        body = gzip.decompress(body)
+    elif encoding == "zstd" or body[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("zstd-encoded object but zstandard is not installed")
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+    return body.decode("utf-8")
@@ -1,6 +1,9 @@
 import boto3
+from botocore.config import Config
 import os
 from core.config import settings
+from s3.services.report_codec import decode_body
+from s3.services.presigned_url_cache import presigned_url_cache, credentials_max_ttl
 
 class S3Service:
     def __init__(self):
@@ -9,9 +12,15 @@ class S3Service:
             's3', 
             region_name=settings.AWS_REGION,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            config=Config(max_pool_connections=settings.S3_POOL_SIZE)
         )
         self.bucket_name = settings.AWS_S3_BUCKET
+        # Same credential resolution as the client above
+        self.url_max_ttl = credentials_max_ttl(boto3.Session(
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+        ).get_credentials())
         print(f"[S3 INIT] Initialized S3 client with bucket={self.bucket_name}, region={settings.AWS_REGION}")
 
     def upload_file(self, file_path, object_name=None, content_type=None, acl="public-read"):
@@ -60,18 +69,24 @@ class S3Service:
             return []
 
     def get_file_content(self, object_name: str) -> str:
-        """Retrieve file content from S3 as UTF-8 string."""
+        """Retrieve file content from S3 as UTF-8 string, decompressing gzip/zstd objects."""
         try:
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name,
                 Key=object_name
             )
-            content = response['Body'].read().decode('utf-8')
+            content = decode_body(response['Body'].read(), response.get('ContentEncoding'))
             print(f"[S3 READ] Successfully read: {object_name}")
             return content
         except Exception as e:
             print(f"[S3 READ ERROR] Failed to read: {object_name} - {str(e)}")
             return ""
 
+    def get_presigned_url(self, object_name: str, expires_in: int = 3600) -> str:
+        """Presigned GET URL, reused from the shared cache while it has enough validity left."""
+        return presigned_url_cache.get_url(
+            self.s3_client, self.bucket_name, object_name, expires_in, max_ttl=self.url_max_ttl
+        )
+
 # Singleton instance
 s3_service = S3Service()
@@ -1,25 +1,45 @@
 import boto3
+from botocore.config import Config
 import json
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from report_service.core.config import settings
+from s3.services.report_codec import decode_body
+from s3.services.presigned_url_cache import presigned_url_cache, credentials_max_ttl
 
 class UserS3Service:
     def __init__(self):
-        self.s3_client = boto3.client('s3', region_name=settings.AWS_REGION)
+        self.s3_client = boto3.client(
+            's3',
+            region_name=settings.AWS_REGION,
+            config=Config(max_pool_connections=settings.S3_POOL_SIZE)
+        )
         self.bucket_name = settings.AWS_S3_BUCKET
+        self.url_max_ttl = credentials_max_ttl(boto3.Session().get_credentials())
+        # Pool for get_user_files' concurrent HEAD requests
+        self.head_executor = ThreadPoolExecutor(
+            max_workers=settings.S3_HEAD_CONCURRENCY,
+            thread_name_prefix="s3-head"
+        )
     
-    def upload_user_report(self, user_id: str, job_id: str, content: str, file_type: str = "json") -> str:
+    def upload_user_report(self, user_id: str, job_id: str, content: Union[str, bytes], file_type: str = "json",
+                           content_encoding: Optional[str] = None) -> str:
         """
         Upload user report (path: reports/{user_id}/{job_id}_report.{file_type})
+
+        content_encoding ("gzip"/"zstd") is stored as the object's Content-Encoding
+        when content has been compressed with report_codec.
         """
         try:
             key = f"reports/{user_id}/{job_id}_report.{file_type}"
+            extra_args = {"ContentEncoding": content_encoding} if content_encoding else {}
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=key,
                 Body=content,
                 ContentType=f"application/{file_type}",
+                **extra_args,
                 Metadata={
                     "user_id": user_id,
                     "job_id": job_id,
@@ -51,41 +71,57 @@ class UserS3Service:
         except Exception as e:
             raise Exception(f"Failed to upload audio: {str(e)}")
   
-    def get_user_files(self, user_id: str, file_type: str = None) -> List[Dict]:
+    def get_user_files(self, user_id: str, file_type: str = None, include_metadata: bool = True,
+                       known_metadata: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict]:
         """
         List user files (reports, audio, visuals)
+
+        Every page of list_objects_v2 is followed. Object metadata comes from
+        known_metadata (e.g. database_service.get_user_file_metadata) when the key
+        is there, otherwise from HEAD requests issued concurrently on head_executor;
+        pass include_metadata=False to skip HEADs entirely.
         """
         try:
             prefix = f"{file_type}/{user_id}/" if file_type else f"{user_id}/"
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            files = []
-            for obj in response.get('Contents', []):
-                metadata_response = self.s3_client.head_object(
-                    Bucket=self.bucket_name,
-                    Key=obj['Key']
-                )
-                files.append({
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            objects = [
+                obj
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                for obj in page.get('Contents', [])
+            ]
+
+            known_metadata = known_metadata or {}
+            metadata_by_key = {obj['Key']: known_metadata[obj['Key']] for obj in objects if obj['Key'] in known_metadata}
+            if include_metadata:
+                missing = [obj['Key'] for obj in objects if obj['Key'] not in metadata_by_key]
+                metadata_by_key.update(zip(missing, self.head_executor.map(self._head_metadata, missing)))
+
+            return [
+                {
                     "key": obj['Key'],
                     "size": obj['Size'],
                     "last_modified": obj['LastModified'].isoformat(),
-                    "metadata": metadata_response.get('Metadata', {})
-                })
-            return files
+                    "metadata": metadata_by_key.get(obj['Key'], {})
+                }
+                for obj in objects
+            ]
         except Exception as e:
             raise Exception(f"Failed to list user files: {str(e)}")
+
+    def _head_metadata(self, s3_key: str) -> Dict[str, Any]:
+        try:
+            return self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key).get('Metadata', {})
+        except Exception as e:
+            print(f"Failed to get metadata for {s3_key}: {str(e)}")
+            return {}
     
     def get_presigned_url(self, s3_key: str, expires_in: int = 3600) -> str:
         """
-        Generate presigned URL for download
+        Generate presigned URL for download (reused from the shared cache while fresh enough)
         """
         try:
-            return self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket_name, 'Key': s3_key},
-                ExpiresIn=expires_in
+            return presigned_url_cache.get_url(
+                self.s3_client, self.bucket_name, s3_key, expires_in, max_ttl=self.url_max_ttl
             )
         except Exception as e:
             raise Exception(f"Failed to generate presigned URL: {str(e)}")
@@ -110,14 +146,14 @@ class UserS3Service:
     
     def get_file_content(self, s3_key: str) -> str:
         """
-        Retrieve file content from S3
+        Retrieve file content from S3 (gzip/zstd objects are decompressed)
         """
         try:
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
-            return response['Body'].read().decode('utf-8')
+            return decode_body(response['Body'].read(), response.get('ContentEncoding'))
         except Exception as e:
             print(f"Failed to get file content: {str(e)}")
             return ""
@@ -131,6 +167,7 @@ class UserS3Service:
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            presigned_url_cache.invalidate(self.bucket_name, s3_key)
         except Exception as e:
             raise Exception(f"Failed to delete file: {str(e)}")
 
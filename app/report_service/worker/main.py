@@ -0,0 +1,58 @@
+"""Report worker entry point: `python -m worker.main`
+
+Starts REPORT_WORKER_PROCESSES processes that consume the Postgres report
+queue. Scale this deployment independently of the API pods.
+"""
+import logging
+import multiprocessing
+import signal
+import threading
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker_process(index: int):
+    from worker.services.job_queue import job_queue
+    from worker.services.report_worker import ReportWorker
+
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [worker-{index}] %(name)s: %(message)s")
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    ReportWorker(job_queue).run_forever(stop_event)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    if settings.REPORT_QUEUE_BACKEND.lower() != "postgres":
+        raise SystemExit("Standalone workers need REPORT_QUEUE_BACKEND=postgres; "
+                         "the memory backend runs workers inside the API process.")
+
+    # spawn so each process builds its own boto3 clients and DB pool
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_worker_process, args=(i,), name=f"report-worker-{i}")
+        for i in range(max(1, settings.REPORT_WORKER_PROCESSES))
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} report worker processes")
+
+    def _shutdown(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
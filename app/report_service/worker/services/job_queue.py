@@ -0,0 +1,321 @@
+import abc
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database.core.database import session_scope
+from database.models.database_models import ReportJobQueueEntry
+from database.services.database_service import database_service
+from analyze.services.state_manager import state_manager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key that serializes admission control across API replicas
+ADMISSION_LOCK_KEY = 0x5245504f5254  # "REPORT"
+
+
+class QueueFullError(Exception):
+    """Raised when admission control rejects a new report job"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class JobQueue(abc.ABC):
+    """Queue of report jobs consumed by report workers
+
+    Admission control rejects new jobs once REPORT_QUEUE_MAX_PENDING jobs are
+    queued or running, or once a user has REPORT_QUEUE_MAX_PENDING_PER_USER.
+    Workers renew their lease (`locked_at`) with heartbeat() while a job runs;
+    entries whose lease is older than the visibility timeout are considered
+    abandoned and are re-queued until REPORT_QUEUE_MAX_ATTEMPTS.
+    """
+
+    def __init__(self):
+        self.max_pending = settings.REPORT_QUEUE_MAX_PENDING
+        self.max_pending_per_user = settings.REPORT_QUEUE_MAX_PENDING_PER_USER
+        self.max_attempts = settings.REPORT_QUEUE_MAX_ATTEMPTS
+        self.visibility_timeout = timedelta(seconds=settings.REPORT_QUEUE_VISIBILITY_TIMEOUT_SECONDS)
+        self.retry_after = settings.REPORT_QUEUE_RETRY_AFTER_SECONDS
+
+    @abc.abstractmethod
+    def submit(self, user_id: str, payload: Dict[str, Any], create_job: Callable[[Session], str]) -> str:
+        """Admit and queue a new job atomically; returns the job ID
+
+        create_job(db) adds the job row to the given session without committing and
+        returns its ID. The capacity check, the job row and the queue entry are
+        committed together, or QueueFullError is raised and nothing is written.
+        Blocking: call it through io_executor from async code.
+        """
+        raise NotImplementedError
+
+    def _check_capacity(self, total: int, for_user: int):
+        """Raise QueueFullError if one more job would exceed the limits"""
+        if total >= self.max_pending:
+            raise QueueFullError("Report queue is full. Please try again later.", self.retry_after)
+        if for_user >= self.max_pending_per_user:
+            raise QueueFullError(
+                f"You already have {self.max_pending_per_user} analyses in progress.", self.retry_after
+            )
+
+    @abc.abstractmethod
+    def dequeue(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Claim the oldest available entry, or return None if there is none"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete(self, entry_id: str):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def heartbeat(self, entry_id: str, worker_id: str) -> bool:
+        """Renew the lease on a running entry; returns False if this worker no longer holds it"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def fail(self, entry_id: str, error: str):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def pending_count(self, user_id: Optional[str] = None) -> int:
+        """Number of queued or running entries, optionally for one user"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def requeue_stale(self) -> int:
+        """Release entries held past the visibility timeout; returns how many were touched"""
+        raise NotImplementedError
+
+    def wait(self, timeout: float):
+        """Block until work may be available or the timeout passes"""
+        time.sleep(timeout)
+
+    def _publish_abandoned(self, job_id: str, user_id: str):
+        """Tell status polls and SSE streams that a job ran out of attempts"""
+        try:
+            state_manager.update_progress(job_id, -1, "Analysis failed: worker did not finish in time")
+            state_manager.mark_job_status(job_id, "failed")
+            state_manager.remove_user_active_job(user_id, job_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish abandoned job {job_id}: {e}")
+
+
+class InMemoryJobQueue(JobQueue):
+    """Process-local backend for tests and single-pod setups"""
+
+    def __init__(self):
+        super().__init__()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._queued = deque()
+        self._condition = threading.Condition(threading.RLock())
+
+    def submit(self, user_id: str, payload: Dict[str, Any], create_job: Callable[[Session], str]) -> str:
+        # Holding the queue lock across the check and the insert keeps concurrent requests from both fitting
+        with self._condition:
+            self._check_capacity(self.pending_count(), self.pending_count(user_id))
+            with session_scope() as db:
+                job_id = create_job(db)
+            entry_id = str(uuid.uuid4())
+            self._entries[entry_id] = {
+                "id": entry_id,
+                "job_id": job_id,
+                "user_id": user_id,
+                "payload": payload,
+                "status": "queued",
+                "attempts": 0,
+                "locked_at": None
+            }
+            self._queued.append(entry_id)
+            self._condition.notify()
+        logger.info(f"Job queued in memory: {job_id}")
+        return job_id
+
+    def dequeue(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            while self._queued:
+                entry = self._entries.get(self._queued.popleft())
+                if entry and entry["status"] == "queued":
+                    entry["status"] = "running"
+                    entry["attempts"] += 1
+                    entry["locked_at"] = datetime.utcnow()
+                    entry["locked_by"] = worker_id
+                    entry["locked_thread"] = threading.current_thread()
+                    return dict(entry)
+        return None
+
+    def complete(self, entry_id: str):
+        with self._condition:
+            self._entries.pop(entry_id, None)
+
+    def heartbeat(self, entry_id: str, worker_id: str) -> bool:
+        with self._condition:
+            entry = self._entries.get(entry_id)
+            if not entry or entry["status"] != "running" or entry.get("locked_by") != worker_id:
+                return False
+            entry["locked_at"] = datetime.utcnow()
+            return True
+
+    def fail(self, entry_id: str, error: str):
+        with self._condition:
+            self._entries.pop(entry_id, None)
+        logger.warning(f"Queue entry {entry_id} failed: {error}")
+
+    def pending_count(self, user_id: Optional[str] = None) -> int:
+        with self._condition:
+            return len([
+                e for e in self._entries.values()
+                if user_id is None or e["user_id"] == user_id
+            ])
+
+    def requeue_stale(self) -> int:
+        cutoff = datetime.utcnow() - self.visibility_timeout
+        touched = 0
+        abandoned = []
+        with self._condition:
+            for entry_id, entry in list(self._entries.items()):
+                if entry["status"] != "running" or entry["locked_at"] > cutoff:
+                    continue
+                # A worker thread of this process that is still alive is still running the job
+                if entry.get("locked_thread") is not None and entry["locked_thread"].is_alive():
+                    continue
+                touched += 1
+                if entry["attempts"] < self.max_attempts:
+                    entry["status"] = "queued"
+                    self._queued.append(entry_id)
+                    self._condition.notify()
+                else:
+                    self._entries.pop(entry_id)
+                    abandoned.append((entry["job_id"], entry["user_id"]))
+
+        if abandoned:
+            with session_scope() as db:
+                for job_id, _ in abandoned:
+                    database_service.update_job_status(db, job_id, "failed", commit=False)
+            for job_id, user_id in abandoned:
+                self._publish_abandoned(job_id, user_id)
+        return touched
+
+    def wait(self, timeout: float):
+        with self._condition:
+            if not self._queued:
+                self._condition.wait(timeout)
+
+
+class PostgresJobQueue(JobQueue):
+    """Durable backend on the report_job_queue table, claimed with FOR UPDATE SKIP LOCKED"""
+
+    def submit(self, user_id: str, payload: Dict[str, Any], create_job: Callable[[Session], str]) -> str:
+        with session_scope() as db:
+            # Transaction-scoped lock: admissions from every replica are serialized until commit
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADMISSION_LOCK_KEY})
+            self._check_capacity(self._pending_count(db), self._pending_count(db, user_id))
+            job_id = create_job(db)
+            db.add(ReportJobQueueEntry(job_id=job_id, user_id=user_id, payload=payload, status="queued"))
+        logger.info(f"Job queued in Postgres: {job_id}")
+        return job_id
+
+    def dequeue(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        with session_scope() as db:
+            entry = db.query(ReportJobQueueEntry).filter(
+                ReportJobQueueEntry.status == "queued",
+                ReportJobQueueEntry.available_at <= datetime.utcnow()
+            ).order_by(ReportJobQueueEntry.created_at).with_for_update(skip_locked=True).first()
+
+            if not entry:
+                return None
+
+            entry.status = "running"
+            entry.attempts = (entry.attempts or 0) + 1
+            entry.locked_by = worker_id
+            entry.locked_at = datetime.utcnow()
+            claimed = {
+                "id": str(entry.id),
+                "job_id": str(entry.job_id),
+                "user_id": entry.user_id,
+                "payload": entry.payload or {},
+                "attempts": entry.attempts
+            }
+        return claimed
+
+    def complete(self, entry_id: str):
+        self._finish(entry_id, "done")
+
+    def heartbeat(self, entry_id: str, worker_id: str) -> bool:
+        with session_scope() as db:
+            renewed = db.query(ReportJobQueueEntry).filter(
+                ReportJobQueueEntry.id == entry_id,
+                ReportJobQueueEntry.status == "running",
+                ReportJobQueueEntry.locked_by == worker_id
+            ).update({ReportJobQueueEntry.locked_at: datetime.utcnow()}, synchronize_session=False)
+        return renewed > 0
+
+    def fail(self, entry_id: str, error: str):
+        self._finish(entry_id, "failed", error)
+
+    def _finish(self, entry_id: str, status: str, error: Optional[str] = None):
+        with session_scope() as db:
+            db.query(ReportJobQueueEntry).filter(ReportJobQueueEntry.id == entry_id).update({
+                ReportJobQueueEntry.status: status,
+                ReportJobQueueEntry.last_error: error,
+                ReportJobQueueEntry.locked_by: None,
+                ReportJobQueueEntry.locked_at: None
+            }, synchronize_session=False)
+
+    def pending_count(self, user_id: Optional[str] = None) -> int:
+        with session_scope() as db:
+            return self._pending_count(db, user_id)
+
+    def _pending_count(self, db: Session, user_id: Optional[str] = None) -> int:
+        query = db.query(func.count(ReportJobQueueEntry.id)).filter(
+            ReportJobQueueEntry.status.in_(["queued", "running"])
+        )
+        if user_id is not None:
+            query = query.filter(ReportJobQueueEntry.user_id == user_id)
+        return query.scalar() or 0
+
+    def requeue_stale(self) -> int:
+        cutoff = datetime.utcnow() - self.visibility_timeout
+        abandoned = []
+        with session_scope() as db:
+            stale = db.query(ReportJobQueueEntry).filter(
+                ReportJobQueueEntry.status == "running",
+                ReportJobQueueEntry.locked_at < cutoff
+            ).with_for_update(skip_locked=True).all()
+
+            for entry in stale:
+                if (entry.attempts or 0) < self.max_attempts:
+                    entry.status = "queued"
+                    entry.available_at = datetime.utcnow()
+                else:
+                    entry.status = "failed"
+                    entry.last_error = "Worker did not finish within the visibility timeout"
+                    # Same transaction as the queue row, so the job never stays "processing"
+                    database_service.update_job_status(db, str(entry.job_id), "failed", commit=False)
+                    abandoned.append((str(entry.job_id), entry.user_id))
+                entry.locked_by = None
+                entry.locked_at = None
+
+        for job_id, user_id in abandoned:
+            self._publish_abandoned(job_id, user_id)
+        return len(stale)
+
+
+def create_job_queue() -> JobQueue:
+    backend = settings.REPORT_QUEUE_BACKEND.lower()
+    if backend == "postgres":
+        return PostgresJobQueue()
+    if backend != "memory":
+        logger.warning(f"Unknown REPORT_QUEUE_BACKEND '{backend}', using memory")
+    return InMemoryJobQueue()
+
+
+job_queue = create_job_queue()
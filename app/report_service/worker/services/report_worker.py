@@ -0,0 +1,105 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import List
+
+from core.config import settings
+from database.core.database import session_scope
+from analyze.services.youtube_analyze_service import youtube_reporter_service
+from worker.services.job_queue import JobQueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReportWorker:
+    """Pulls report jobs off the queue and runs them outside the API event loop"""
+
+    def __init__(self, job_queue: JobQueue, worker_id: str = None):
+        self.job_queue = job_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.poll_interval = settings.REPORT_QUEUE_POLL_INTERVAL_SECONDS
+        self.stale_check_interval = max(self.poll_interval, 60.0)
+        # Renew well inside the visibility timeout so a slow heartbeat never lets the lease lapse
+        self.heartbeat_interval = max(1.0, min(settings.REPORT_QUEUE_HEARTBEAT_SECONDS,
+                                               settings.REPORT_QUEUE_VISIBILITY_TIMEOUT_SECONDS / 3))
+
+    def run_forever(self, stop_event: threading.Event):
+        logger.info(f"Report worker started: {self.worker_id}")
+        last_stale_check = 0.0
+
+        while not stop_event.is_set():
+            if time.monotonic() - last_stale_check >= self.stale_check_interval:
+                last_stale_check = time.monotonic()
+                try:
+                    requeued = self.job_queue.requeue_stale()
+                    if requeued:
+                        logger.warning(f"Released {requeued} stale queue entries")
+                except Exception as e:
+                    logger.warning(f"Stale entry check failed: {e}")
+
+            try:
+                entry = self.job_queue.dequeue(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to dequeue report job: {e}")
+                stop_event.wait(self.poll_interval)
+                continue
+
+            if not entry:
+                self.job_queue.wait(self.poll_interval)
+                continue
+
+            self._run(entry)
+
+        logger.info(f"Report worker stopped: {self.worker_id}")
+
+    def _run(self, entry: dict):
+        job_id = entry["job_id"]
+        payload = entry.get("payload", {})
+        logger.info(f"Worker {self.worker_id} picked up job {job_id} (attempt {entry.get('attempts')})")
+
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(entry["id"], heartbeat_stop),
+                                     name=f"{threading.current_thread().name}-heartbeat", daemon=True)
+        heartbeat.start()
+
+        try:
+            # Each job gets its own session, independent of any request that queued it
+            with session_scope() as db:
+                asyncio.run(youtube_reporter_service.process_youtube_analysis(
+                    job_id=job_id,
+                    user_id=entry["user_id"],
+                    youtube_url=payload.get("youtube_url", ""),
+                    db=db,
+                    include_audio=payload.get("include_audio", True)
+                ))
+            self.job_queue.complete(entry["id"])
+        except Exception as e:
+            logger.error(f"Report job failed: {job_id} - {str(e)}")
+            self.job_queue.fail(entry["id"], str(e))
+        finally:
+            heartbeat_stop.set()
+
+    def _heartbeat(self, entry_id: str, stop_event: threading.Event):
+        """Keep the queue lease alive while _run works on the entry"""
+        while not stop_event.wait(self.heartbeat_interval):
+            try:
+                if not self.job_queue.heartbeat(entry_id, self.worker_id):
+                    logger.warning(f"Lost the lease on queue entry {entry_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"Queue heartbeat failed for {entry_id} (will retry): {e}")
+
+
+def start_worker_threads(job_queue: JobQueue, count: int, stop_event: threading.Event) -> List[threading.Thread]:
+    """Run workers as daemon threads of the current process (used with the in-memory queue)"""
+    threads = []
+    for i in range(count):
+        worker = ReportWorker(job_queue, worker_id=f"{socket.gethostname()}:{os.getpid()}:thread-{i}")
+        thread = threading.Thread(target=worker.run_forever, args=(stop_event,),
+                                  name=f"report-worker-{i}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads